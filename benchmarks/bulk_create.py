@@ -0,0 +1,59 @@
+"""
+POST /posts/bulk against one POST /posts per item.
+
+    python benchmarks/bulk_create.py --posts 5000
+"""
+import argparse
+import json
+import time
+
+from common import setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type = int, default = 5000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    import jwt
+
+    from django.conf  import settings
+    from django.test  import Client
+    from posts.models import Post
+    from users.models import User
+
+    user   = User.objects.create(name = 'bench', email = 'bench@wanted.com', password = 'bench')
+    header = {'HTTP_AUTHORIZATION' : jwt.encode({'id' : user.id}, settings.SECRET_KEY, algorithm = 'HS256')}
+    client = Client()
+    items  = [{'title' : f'bench {i}', 'content' : '벤치마크 content ' * 20} for i in range(args.posts)]
+
+    started = time.perf_counter()
+
+    for item in items:
+        client.post('/posts', json.dumps(item), content_type = 'application/json', **header)
+
+    single = time.perf_counter() - started
+
+    Post.objects.all().delete()
+
+    started = time.perf_counter()
+
+    for offset in range(0, len(items), settings.POST_BULK_MAX_ITEMS):
+        chunk = items[offset:offset + settings.POST_BULK_MAX_ITEMS]
+        client.post('/posts/bulk', json.dumps(chunk), content_type = 'application/json', **header)
+
+    bulk = time.perf_counter() - started
+
+    assert Post.objects.count() == args.posts
+
+    print(json.dumps({
+        'posts'  : args.posts,
+        'single' : {'seconds' : round(single, 3), 'posts_per_second' : round(args.posts / single)},
+        'bulk'   : {'seconds' : round(bulk, 3), 'posts_per_second' : round(args.posts / bulk)},
+    }, indent = 4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+import os
+import sys
+
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django(test_db = True):
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'wanted.settings')
+
+    import django
+
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db              import connection
+
+    if test_db:
+        connection.creation.create_test_db(verbosity = 0, autoclobber = True)
+    else:
+        call_command('migrate', run_syncdb = True, verbosity = 0)
+
+
+def percentile(values, q):
+    if not values:
+        return None
+
+    values = sorted(values)
+
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def summarize(latencies):
+    return {
+        'requests' : len(latencies),
+        'p50_ms'   : round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms'   : round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms'   : round(percentile(latencies, 0.99) * 1000, 2),
+        'max_ms'   : round(max(latencies) * 1000, 2),
+    }
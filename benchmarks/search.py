@@ -0,0 +1,94 @@
+"""
+posts_fts trigram search against a LIKE '%q%' scan on a seeded corpus.
+
+Every post mixes common words with two words from a large random Korean
+vocabulary, so the benchmark reports selective queries (rare words), queries
+without any match and queries for words found in most posts.
+
+    python benchmarks/search.py --posts 200000
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+from common import setup_django
+
+
+WORDS = [
+    '개발', '백엔드', '프론트엔드', '데이터베이스', '인덱스', '성능', '캐시', '검색', '게시물', '사용자',
+    '장고', '파이썬', '서버', '배포', '테스트', '코딩은', '재밌다', '오늘은', '회고', '프로젝트',
+    'django', 'python', 'sqlite', 'backend', 'latency', 'cache', 'search', 'index', 'query', 'deploy',
+]
+
+
+def rare_word(rng):
+    return ''.join(chr(0xAC00 + rng.randrange(11172)) for _ in range(3))
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def timed(func, repeat):
+    samples = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+
+    return round(statistics.median(samples) * 1000, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type = int, default = 200000)
+    parser.add_argument('--limit', type = int, default = 20)
+    parser.add_argument('--repeat', type = int, default = 5)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from posts.models import Post
+    from posts.search import _search_fts, _search_like
+    from users.models import User
+
+    rng        = random.Random(0)
+    vocabulary = [rare_word(rng) for _ in range(max(1, args.posts // 10))]
+    user       = User.objects.create(name = 'bench', email = 'bench@wanted.com', password = 'bench')
+
+    Post.objects.bulk_create(
+        (
+            Post(
+                author  = user.name,
+                user    = user,
+                title   = sentence(rng, 4),
+                content = ' '.join([sentence(rng, rng.randint(10, 200)), rng.choice(vocabulary), rng.choice(vocabulary)]),
+            )
+            for _ in range(args.posts)
+        ),
+        batch_size = 5000,
+    )
+
+    queries = {
+        'selective' : vocabulary[:3],
+        'no_match'  : ['없는검색어', 'nomatchterm'],
+        'common'    : ['데이터베이스', 'latency'],
+    }
+    results = {}
+
+    for kind, words in queries.items():
+        for query in words:
+            terms = query.split()
+            results[f'{kind}:{query}'] = {
+                'fts_ms'  : timed(lambda: _search_fts(terms, args.limit, None), args.repeat),
+                'like_ms' : timed(lambda: _search_like(terms, args.limit, None), args.repeat),
+            }
+
+    print(json.dumps({'posts' : args.posts, 'limit' : args.limit, 'queries' : results}, ensure_ascii = False, indent = 4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Read latency of /posts/list while sign-ins saturate the server.
+
+Runs the ASGI application in-process once with the sync auth views (bcrypt on
+the request thread) and once with the async auth views (bcrypt in the password
+process pool), and prints the read latency percentiles of both runs as JSON.
+
+    python benchmarks/signin_saturation.py --duration 5 --logins 8
+"""
+import argparse
+import asyncio
+import collections
+import json
+import os
+import subprocess
+import sys
+import time
+
+from common import setup_django, summarize
+
+
+async def drive(duration, logins):
+    from django.test import AsyncClient
+
+    client    = AsyncClient()
+    deadline  = time.perf_counter() + duration
+    latencies = []
+    statuses  = collections.Counter()
+    body      = json.dumps({'email' : 'bench@wanted.com', 'password' : 'bench123!!'})
+
+    async def sign_in_loop():
+        while time.perf_counter() < deadline:
+            response = await client.post('/users/sign-in', body, content_type = 'application/json')
+            statuses[response.status_code] += 1
+
+    async def read_loop():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            await client.get('/posts/list?offset=0&limit=5')
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(read_loop(), *[sign_in_loop() for _ in range(logins)])
+
+    return {'reads' : summarize(latencies), 'sign_in_statuses' : dict(statuses)}
+
+
+def run(duration, logins):
+    setup_django()
+
+    from posts.models  import Post
+    from users.hashing import hash_password
+    from users.models  import User
+
+    user = User.objects.create(name = 'bench', email = 'bench@wanted.com', password = hash_password('bench123!!'))
+    Post.objects.bulk_create(
+        Post(author = user.name, user = user, title = f'bench {i}', content = 'bench ' * 50) for i in range(100)
+    )
+
+    asyncio.run(drive(1, 1))
+
+    return {
+        'idle'      : asyncio.run(drive(duration, 0)),
+        'saturated' : asyncio.run(drive(duration, logins)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--duration', type = float, default = 5)
+    parser.add_argument('--logins', type = int, default = 8)
+    parser.add_argument('--mode', choices = ['sync', 'async'])
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run(args.duration, args.logins)))
+        return
+
+    results = {}
+
+    for mode in ('sync', 'async'):
+        env = dict(os.environ, WANTED_ASYNC_AUTH_VIEWS = 'True' if mode == 'async' else 'False')
+
+        output = subprocess.run(
+            [sys.executable, __file__, '--mode', mode, '--duration', str(args.duration), '--logins', str(args.logins)],
+            env = env, check = True, capture_output = True, text = True,
+        ).stdout
+
+        results[mode] = json.loads(output.splitlines()[-1])
+
+    print(json.dumps(results, indent = 4))
+
+
+if __name__ == '__main__':
+    main()
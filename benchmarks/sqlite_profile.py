@@ -0,0 +1,122 @@
+"""
+Concurrent read/write throughput of the development and production SQLite
+profiles (WANTED_DB_PROFILE).
+
+Each profile runs in its own process against a fresh database file. Reader
+threads request /posts/list and writer threads POST /posts through the Django
+test client, so connections are opened and closed the way requests do.
+
+    python benchmarks/sqlite_profile.py --duration 5 --readers 8 --writers 2
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from common import setup_django
+
+
+def run(duration, readers, writers):
+    setup_django(test_db = False)
+
+    import jwt
+
+    from django.conf  import settings
+    from django.db    import connection
+    from django.test  import Client
+    from posts.models import Post
+    from users.models import User
+
+    user = User.objects.create(name = 'bench', email = 'bench@wanted.com', password = 'bench')
+    Post.objects.bulk_create(
+        Post(author = user.name, user = user, title = f'bench {i}', content = 'bench ' * 50) for i in range(1000)
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode')
+        journal_mode = cursor.fetchone()[0]
+
+    connection.close()
+
+    header   = {'HTTP_AUTHORIZATION' : jwt.encode({'id' : user.id}, settings.SECRET_KEY, algorithm = 'HS256')}
+    body     = json.dumps({'title' : 'bench', 'content' : 'bench ' * 50})
+    deadline = time.perf_counter() + duration
+    counts   = {'reads' : 0, 'writes' : 0, 'errors' : 0}
+    lock     = threading.Lock()
+
+    def loop(request, kind):
+        client = Client(raise_request_exception = False)
+
+        while time.perf_counter() < deadline:
+            response = request(client)
+
+            with lock:
+                counts[kind if response.status_code < 500 else 'errors'] += 1
+
+        connection.close()
+
+    threads  = [
+        threading.Thread(target = loop, args = (lambda client: client.get('/posts/list?offset=500&limit=20'), 'reads'))
+        for _ in range(readers)
+    ]
+    threads += [
+        threading.Thread(target = loop, args = (
+            lambda client: client.post('/posts', body, content_type = 'application/json', **header), 'writes'
+        ))
+        for _ in range(writers)
+    ]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'journal_mode'      : journal_mode,
+        'reads_per_second'  : round(counts['reads'] / duration),
+        'writes_per_second' : round(counts['writes'] / duration),
+        'errors'            : counts['errors'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--duration', type = float, default = 5)
+    parser.add_argument('--readers', type = int, default = 8)
+    parser.add_argument('--writers', type = int, default = 2)
+    parser.add_argument('--run', action = 'store_true')
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run(args.duration, args.readers, args.writers)))
+        return
+
+    results = {}
+
+    for profile in ('development', 'production'):
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(
+                os.environ,
+                WANTED_DB_PROFILE = profile,
+                WANTED_DB_NAME    = os.path.join(directory, 'bench.sqlite3'),
+            )
+
+            output = subprocess.run(
+                [
+                    sys.executable, __file__, '--run', '--duration', str(args.duration),
+                    '--readers', str(args.readers), '--writers', str(args.writers),
+                ],
+                env = env, check = True, capture_output = True, text = True,
+            ).stdout
+
+        results[profile] = json.loads(output.splitlines()[-1])
+
+    print(json.dumps(results, indent = 4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+import asyncio
+import contextvars
+import json
+import logging
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse       import urlsplit
+
+from asgiref.sync import async_to_sync
+from django.conf  import settings
+from django.db    import close_old_connections
+from django.http  import HttpRequest, QueryDict
+from django.urls  import Resolver404, resolve
+
+
+logger = logging.getLogger('django.request')
+
+METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+# Conditional headers of the batch request do not apply to its sub-requests.
+SKIPPED_META = ('CONTENT_LENGTH', 'CONTENT_TYPE', 'QUERY_STRING', 'HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE')
+
+_executor      = None
+_executor_lock = threading.Lock()
+
+
+def _read_executor():
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers = settings.BATCH_READ_WORKERS, thread_name_prefix = 'batch')
+
+        return _executor
+
+
+def validate(item):
+    if not isinstance(item, dict) or 'method' not in item or 'path' not in item:
+        return 'KEY_ERROR'
+
+    if not isinstance(item['method'], str) or not isinstance(item['path'], str):
+        return 'VALUE_ERROR'
+
+    if item['method'].upper() not in METHODS:
+        return 'METHOD_NOT_ALLOWED'
+
+    if not urlsplit(item['path']).path.startswith(settings.BATCH_PATHS):
+        return 'UNSUPPORTED_PATH'
+
+
+def build_request(parent, item, user):
+    url     = urlsplit(item['path'])
+    body    = json.dumps(item['body']).encode('utf-8') if 'body' in item else b''
+    request = HttpRequest()
+
+    request.method    = item['method'].upper()
+    request.path      = request.path_info = url.path
+    request.META      = {key : value for key, value in parent.META.items() if key not in SKIPPED_META}
+    request.META.update(
+        REQUEST_METHOD = request.method,
+        PATH_INFO      = url.path,
+        QUERY_STRING   = url.query,
+        CONTENT_TYPE   = 'application/json',
+        CONTENT_LENGTH = str(len(body)),
+    )
+    request.GET       = QueryDict(url.query)
+    request._body     = body
+    request._set_content_type_params(request.META)
+
+    if user is not None:
+        request.user = user
+
+    return request
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+def dispatch(request):
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return {'status' : 404, 'body' : {'MESSAGE' : 'NOT_FOUND'}}
+
+    request.resolver_match = match
+
+    try:
+        response = match.func(request, *match.args, **match.kwargs)
+
+        if asyncio.iscoroutine(response):
+            response = async_to_sync(_await)(response)
+
+    except Exception:
+        logger.exception('Batch sub-request failed: %s %s', request.method, request.get_full_path())
+
+        return {'status' : 500, 'body' : {'MESSAGE' : 'SERVER_ERROR'}}
+
+    return serialize(response)
+
+
+def serialize(response):
+    if response.streaming:
+        return {'status' : 400, 'body' : {'MESSAGE' : 'STREAMING_NOT_SUPPORTED'}}
+
+    if response.get('Content-Type', '').startswith('application/json') and response.content:
+        body = json.loads(response.content)
+    else:
+        body = response.content.decode(response.charset)
+
+    return {'status' : response.status_code, 'body' : body}
+
+
+def _dispatch_in_worker(context, request):
+    # Pool threads keep their own connections, closed the way Django closes
+    # them around a normal request.
+    close_old_connections()
+
+    try:
+        return context.run(dispatch, request)
+    finally:
+        close_old_connections()
+
+
+def run_batch(parent, items, user):
+    requests = [build_request(parent, item, user) for item in items]
+    results  = [None] * len(requests)
+    index    = 0
+
+    # Sub-requests keep their order: each run of consecutive GETs is spread
+    # over the read pool, everything else runs one at a time in this thread.
+    while index < len(requests):
+        end = index + 1
+
+        while end < len(requests) and requests[end].method == 'GET' and requests[index].method == 'GET':
+            end += 1
+
+        if end - index > 1 and settings.BATCH_READ_WORKERS > 1:
+            futures = [
+                _read_executor().submit(_dispatch_in_worker, contextvars.copy_context(), request)
+                for request in requests[index:end]
+            ]
+            results[index:end] = [future.result() for future in futures]
+        else:
+            results[index:end] = [dispatch(request) for request in requests[index:end]]
+
+        index = end
+
+    return results
@@ -0,0 +1,67 @@
+import threading
+import time
+
+from collections import OrderedDict
+from contextlib  import contextmanager
+
+
+class LocalLRUCache:
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout  = timeout
+        self._data    = OrderedDict()
+        self._lock    = threading.Lock()
+
+    def get(self, key, default = None):
+        with self._lock:
+            try:
+                expires_at, value = self._data[key]
+            except KeyError:
+                return default
+
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.timeout, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_size:
+                self._data.popitem(last = False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class KeyedLocks:
+    def __init__(self):
+        self._locks = {}
+        self._lock  = threading.Lock()
+
+    @contextmanager
+    def __call__(self, key):
+        with self._lock:
+            entry     = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+
+        try:
+            with entry[0]:
+                yield
+
+        finally:
+            with self._lock:
+                entry[1] -= 1
+
+                if not entry[1]:
+                    del self._locks[key]
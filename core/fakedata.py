@@ -0,0 +1,94 @@
+"""
+Synthetic users and posts for manage.py seed and manage.py bench.
+
+Pure Python with no Django imports, so seeding can generate rows in spawned
+worker processes while the parent process does the inserts.
+"""
+import random
+
+from datetime import timedelta
+
+from posts.text import make_excerpt
+
+
+KOREAN_SURNAMES  = '김이박최정강조윤장임한오서신권황안송류홍전고문양손배백허남심노하곽성차주우구민유나진지엄채원천방공현함변염여추도소석선설마길연위표명기반왕금옥육인맹제모탁국어은편용예경봉사부가복태목형피두감호제'
+KOREAN_SYLLABLES = '민서지현수준영우진하윤도연성재은유아예주원태희승혜경시채다온율건찬호선소미나라보람규한결'
+ENGLISH_FIRST    = [
+    'James', 'Mary', 'John', 'Linda', 'David', 'Susan', 'Daniel', 'Emma', 'Michael', 'Olivia',
+    'Chris', 'Sophia', 'Ryan', 'Grace', 'Kevin', 'Chloe', 'Brian', 'Hannah', 'Jason', 'Julia',
+]
+ENGLISH_LAST     = [
+    'Kim', 'Lee', 'Park', 'Smith', 'Brown', 'Jones', 'Miller', 'Davis', 'Wilson', 'Moore',
+    'Taylor', 'Clark', 'Lewis', 'Walker', 'Hall', 'Young', 'King', 'Wright', 'Green', 'Baker',
+]
+EMAIL_DOMAINS    = ['gmail.com', 'naver.com', 'kakao.com', 'daum.net', 'wanted.co.kr', 'example.com']
+
+KOREAN_WORDS  = [
+    '오늘은', '백엔드', '개발자', '채용', '공고를', '보고', '지원했습니다', '면접', '후기', '정리해', '봅니다',
+    '회사', '서비스', '데이터베이스', '성능', '개선', '캐시', '도입', '프로젝트', '경험을', '공유합니다',
+    '팀원들과', '함께', '코드', '리뷰를', '진행했고', '배포', '자동화', '서버', '비용이', '줄었습니다',
+    '신입', '경력', '이직', '준비', '중인', '분들께', '도움이', '되었으면', '좋겠습니다', '질문', '환영합니다',
+    '파이썬', '장고', '쿼리', '인덱스', '트래픽', '장애', '대응', '모니터링', '새로운', '기능을', '출시했습니다',
+]
+ENGLISH_WORDS = [
+    'today', 'we', 'shipped', 'a', 'new', 'backend', 'feature', 'for', 'the', 'hiring', 'platform',
+    'interview', 'review', 'database', 'query', 'index', 'cache', 'latency', 'improved', 'team', 'project',
+    'deploy', 'pipeline', 'server', 'traffic', 'incident', 'monitoring', 'python', 'django', 'career',
+    'junior', 'senior', 'developer', 'notes', 'sharing', 'experience', 'questions', 'welcome', 'with',
+]
+
+
+def _stamp(end, count, number, gap, rng):
+    # Spread rows evenly up to `end`, oldest first, so created_at grows with id.
+    return str(end - timedelta(seconds = (count - number) * gap - rng.randint(0, gap - 1)))
+
+
+def korean_name(rng):
+    return rng.choice(KOREAN_SURNAMES) + rng.choice(KOREAN_SYLLABLES) + rng.choice(KOREAN_SYLLABLES)
+
+
+def english_name(rng):
+    return f'{rng.choice(ENGLISH_FIRST)} {rng.choice(ENGLISH_LAST)}'[:16]
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(words) for _ in range(rng.randint(4, 12))) + '.'
+
+
+def generate_users(first_id, count, password, end, seed):
+    rng  = random.Random(seed)
+    rows = []
+
+    for user_id in range(first_id, first_id + count):
+        korean = rng.random() < 0.7
+        name   = korean_name(rng) if korean else english_name(rng)
+        stamp  = _stamp(end, first_id + count, user_id, 300, rng)
+
+        rows.append((name, f'user{user_id}@{rng.choice(EMAIL_DOMAINS)}', password, stamp, stamp))
+
+    return rows
+
+
+_authors = []
+
+
+def set_authors(authors):
+    _authors[:] = authors
+
+
+def generate_posts(start, count, total, end, seed):
+    rng  = random.Random(seed)
+    rows = []
+
+    for number in range(start, start + count):
+        user_id, author = rng.choice(_authors)
+        words           = KOREAN_WORDS if rng.random() < 0.7 else ENGLISH_WORDS
+        # Log-normal sentence counts: mostly short posts with a long tail.
+        sentences       = min(int(rng.lognormvariate(1.2, 1.0)) + 1, 80)
+        title           = ' '.join(rng.choice(words) for _ in range(rng.randint(2, 8)))[:200]
+        content         = ' '.join(sentence(rng, words) for _ in range(sentences))
+        stamp           = _stamp(end, total, number, 30, rng)
+
+        rows.append((user_id, author, title, content, make_excerpt(content), stamp, stamp))
+
+    return rows
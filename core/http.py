@@ -0,0 +1,28 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http  import http_date, quote_etag
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.md5(':'.join(map(str, parts)).encode('utf-8')).hexdigest())
+
+
+def is_conditional(request):
+    return 'HTTP_IF_NONE_MATCH' in request.META or 'HTTP_IF_MODIFIED_SINCE' in request.META
+
+
+def set_validators(response, etag, last_modified = None):
+    response['ETag'] = etag
+
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+
+    return response
+
+
+def not_modified(request, etag, last_modified = None):
+    response = get_conditional_response(request, etag = etag, last_modified = last_modified)
+
+    if response is not None:
+        return set_validators(response, etag, last_modified)
@@ -0,0 +1,187 @@
+import contextlib
+import json
+import os
+import random
+import time
+import jwt
+
+from django.conf                 import settings
+from django.core.cache           import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db                   import connection, connections
+from django.test                 import Client
+from django.test.utils           import override_settings, setup_test_environment, teardown_test_environment
+
+from core          import fakedata
+from core.metrics  import QueryTimer
+from core.seeding  import SEED_PASSWORD, seed_posts, seed_users
+from posts.models  import Post
+from posts.search  import MIN_MATCH_LENGTH
+from users.models  import User
+
+
+def percentile(values, q):
+    values = sorted(values)
+
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds a throwaway test database with users/posts and drives the endpoints through the test client, '
+        'printing latency percentiles, throughput and query counts as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type = int, default = 1000)
+        parser.add_argument('--posts', type = int, default = 100000)
+        parser.add_argument('--requests', type = int, default = 200, help = 'Requests per scenario.')
+        parser.add_argument('--batch-size', type = int, default = 10000, help = 'Rows per seeding transaction.')
+        parser.add_argument('--workers', type = int, default = os.cpu_count(), help = 'Seeding generator processes.')
+        parser.add_argument('--keepdb', action = 'store_true', help = 'Keep and reuse the seeded test database.')
+        parser.add_argument('--output', help = 'Also write the JSON report to this file.')
+        parser.add_argument('--baseline', help = 'Compare against a report written by a previous run.')
+        parser.add_argument(
+            '--threshold', type = float, default = 0.2,
+            help = 'Relative p95 increase reported as a regression (default 0.2 = 20%%).',
+        )
+        parser.add_argument('--fail-on-regression', action = 'store_true')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity = 0, autoclobber = True, keepdb = options['keepdb'])
+
+        # The scenarios repeat anonymous GETs the micro-cache would answer
+        # without running the view, so it stays off while they run.
+        try:
+            self.seed(options)
+
+            with override_settings(MICROCACHE_TIMEOUT = 0):
+                report = self.run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity = 0, keepdb = options['keepdb'])
+            teardown_test_environment()
+
+        if options['baseline']:
+            with open(options['baseline']) as file:
+                report['comparison'] = self.compare(json.load(file), report, options['threshold'])
+
+        output = json.dumps(report, indent = 4)
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(output)
+
+        self.stdout.write(output)
+
+        if options['fail_on_regression'] and report.get('comparison', {}).get('regressions'):
+            raise CommandError(f'Regressions: {", ".join(report["comparison"]["regressions"])}')
+
+    def seed(self, options):
+        users = options['users'] - User.objects.count()
+        posts = options['posts'] - Post.objects.count()
+
+        if users > 0:
+            seed_users(users, options['batch_size'], options['workers'])
+
+        if posts > 0:
+            seed_posts(posts, options['batch_size'], options['workers'])
+
+    def scenarios(self, rng):
+        user     = User.objects.order_by('id').first()
+        header   = {'HTTP_AUTHORIZATION' : jwt.encode({'id' : user.id}, settings.SECRET_KEY, algorithm = 'HS256')}
+        last_id  = Post.objects.order_by('-id').values_list('id', flat = True).first()
+        total    = Post.objects.count()
+        sign_in  = json.dumps({'email' : user.email, 'password' : SEED_PASSWORD})
+        new_post = json.dumps({'title' : 'bench', 'content' : 'bench content'})
+        words    = fakedata.KOREAN_WORDS + fakedata.ENGLISH_WORDS
+        phrases  = [word for word in words if len(word) >= MIN_MATCH_LENGTH]
+        short    = [word for word in fakedata.KOREAN_WORDS if len(word) < MIN_MATCH_LENGTH]
+
+        return {
+            'PostView.get'             : lambda client: client.get(f'/posts/{rng.randint(1, last_id)}'),
+            'PostView.get ids'         : lambda client: client.get(
+                '/posts?ids=' + ','.join(str(rng.randint(1, last_id)) for _ in range(20))
+            ),
+            'PostView.post'            : lambda client: client.post(
+                '/posts', new_post, content_type = 'application/json', **header
+            ),
+            'PostListView.get'         : lambda client: client.get(
+                f'/posts/list?offset={rng.randint(0, max(total - 20, 0))}&limit=20'
+            ),
+            'PostListView.get cursor'  : lambda client: client.get('/posts/list?cursor=&limit=20'),
+            'PostSearchView.get'       : lambda client: client.get('/posts/search', {'q' : rng.choice(phrases)}),
+            'PostSearchView.get short' : lambda client: client.get('/posts/search', {'q' : rng.choice(short)}),
+            'SignInView.post'          : lambda client: client.post(
+                '/users/sign-in', sign_in, content_type = 'application/json'
+            ),
+        }
+
+    def run(self, options):
+        rng     = random.Random(0)
+        client  = Client()
+        results = {}
+
+        for name, request in self.scenarios(rng).items():
+            for alias in settings.CACHES:
+                caches[alias].clear()
+
+            latencies = []
+            queries   = []
+            errors    = 0
+            started   = time.perf_counter()
+
+            for _ in range(options['requests']):
+                timer = QueryTimer()
+
+                with contextlib.ExitStack() as stack:
+                    for database in connections.all():
+                        stack.enter_context(database.execute_wrapper(timer))
+
+                    request_started = time.perf_counter()
+                    response        = request(client)
+                    latencies.append(time.perf_counter() - request_started)
+
+                queries.append(timer.count)
+                errors += response.status_code >= 400
+
+            elapsed = time.perf_counter() - started
+
+            results[name] = {
+                'requests'            : len(latencies),
+                'errors'              : errors,
+                'p50_ms'              : round(percentile(latencies, 0.50) * 1000, 2),
+                'p95_ms'              : round(percentile(latencies, 0.95) * 1000, 2),
+                'p99_ms'              : round(percentile(latencies, 0.99) * 1000, 2),
+                'throughput_rps'      : round(len(latencies) / elapsed, 1),
+                'queries_per_request' : round(sum(queries) / len(queries), 2),
+            }
+
+        return {
+            'dataset'   : {'users' : User.objects.count(), 'posts' : Post.objects.count()},
+            'scenarios' : results,
+        }
+
+    def compare(self, baseline, report, threshold):
+        comparison = {'scenarios' : {}, 'regressions' : []}
+
+        for name, current in report['scenarios'].items():
+            previous = baseline.get('scenarios', {}).get(name)
+
+            if not previous:
+                continue
+
+            change = (current['p95_ms'] - previous['p95_ms']) / previous['p95_ms'] if previous['p95_ms'] else 0.0
+
+            comparison['scenarios'][name] = {
+                'p95_ms'              : {'baseline' : previous['p95_ms'], 'current' : current['p95_ms']},
+                'p95_change'          : round(change, 3),
+                'queries_per_request' : {
+                    'baseline' : previous['queries_per_request'], 'current' : current['queries_per_request']
+                },
+            }
+
+            if change > threshold or current['queries_per_request'] > previous['queries_per_request']:
+                comparison['regressions'].append(name)
+
+        return comparison
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from core.profiling import make_token
+
+
+class Command(BaseCommand):
+    help = 'Prints a signed X-Profile header value that profiles a request and downloads its profile.'
+
+    def handle(self, *args, **options):
+        self.stdout.write(make_token())
@@ -0,0 +1,40 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.seeding import SEED_PASSWORD, seed_posts, seed_users
+
+
+class Command(BaseCommand):
+    help = (
+        'Inserts synthetic users and posts (Korean/English names and content of varied length) in batched '
+        'transactions, generating rows in worker processes. Seeded users sign in with the password '
+        f'"{SEED_PASSWORD}". The search index is rebuilt once after the posts are loaded.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type = int, default = 0)
+        parser.add_argument('--posts', type = int, default = 0)
+        parser.add_argument('--batch-size', type = int, default = 10000, help = 'Rows per transaction.')
+        parser.add_argument('--workers', type = int, default = os.cpu_count(), help = 'Generator processes.')
+        parser.add_argument('--seed', type = int, default = 0, help = 'Random seed.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+
+        for name, function in (('users', seed_users), ('posts', seed_posts)):
+            if not options[name]:
+                continue
+
+            started = time.perf_counter()
+
+            try:
+                function(options[name], options['batch_size'], options['workers'], options['seed'])
+            except ValueError as error:
+                raise CommandError(error)
+
+            elapsed = time.perf_counter() - started
+
+            self.stdout.write(f'Seeded {options[name]} {name} in {elapsed:.1f}s ({options[name] / elapsed:.0f} rows/s)')
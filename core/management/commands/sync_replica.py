@@ -0,0 +1,44 @@
+import sqlite3
+import time
+
+from django.conf                 import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db                   import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = 'Copies the default SQLite database onto the replica with the SQLite backup API.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type = float, default = 0, help = 'Repeat every N seconds.')
+
+    def handle(self, *args, **options):
+        replica = settings.REPLICA_DATABASE
+
+        if not replica:
+            raise CommandError('No replica database is configured (set WANTED_REPLICA_NAME).')
+
+        if connections[DEFAULT_DB_ALIAS].vendor != 'sqlite' or connections[replica].vendor != 'sqlite':
+            raise CommandError('sync_replica only copies SQLite databases.')
+
+        while True:
+            started = time.perf_counter()
+
+            self.copy(settings.DATABASES[DEFAULT_DB_ALIAS]['NAME'], settings.DATABASES[replica]['NAME'])
+
+            self.stdout.write(f'Synced {replica} in {time.perf_counter() - started:.3f}s')
+
+            if not options['interval']:
+                break
+
+            time.sleep(options['interval'])
+
+    def copy(self, source_name, target_name):
+        source = sqlite3.connect(source_name)
+        target = sqlite3.connect(target_name)
+
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
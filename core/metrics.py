@@ -0,0 +1,198 @@
+import atexit
+import contextlib
+import contextvars
+import copy
+import json
+import os
+import tempfile
+import threading
+import time
+
+from pathlib import Path
+
+from django.conf import settings
+
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS    = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+HISTOGRAMS = {
+    'wanted_request_duration_seconds'    : ('Request wall time per view.', DURATION_BUCKETS),
+    'wanted_request_db_queries'          : ('Database queries per request per view.', QUERY_BUCKETS),
+    'wanted_request_db_duration_seconds' : ('Database time per request per view.', DURATION_BUCKETS),
+}
+
+
+class QueryTimer:
+    def __init__(self):
+        self.count    = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count    += 1
+            self.duration += time.perf_counter() - started
+
+
+_active_timer = contextvars.ContextVar('active_query_timer', default = None)
+
+
+def time_queries(execute, sql, params, many, context):
+    timer = _active_timer.get()
+
+    if timer is None:
+        return execute(sql, params, many, context)
+
+    return timer(execute, sql, params, many, context)
+
+
+def install_query_timer(sender, connection, **kwargs):
+    # Inserted first: execute_wrapper() pops the last wrapper when it exits,
+    # and a connection can be opened inside one.
+    if time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, time_queries)
+
+
+@contextlib.contextmanager
+def timing_queries(timer):
+    token = _active_timer.set(timer)
+
+    try:
+        yield
+    finally:
+        _active_timer.reset(token)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Collector:
+    """
+    Per-process metrics. When METRICS_DIR is set every process periodically
+    writes its snapshot to METRICS_DIR/<pid>.json and render() merges the
+    snapshots of all processes, so any worker can answer /metrics.
+    """
+
+    def __init__(self):
+        self._lock       = threading.Lock()
+        self._counters   = {}
+        self._flushed_at = 0.0
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {name : {} for name in HISTOGRAMS}
+
+    def register_counter(self, name, help_text, source):
+        self._counters[name] = (help_text, source)
+
+    def observe(self, name, view, value):
+        buckets = HISTOGRAMS[name][1]
+
+        with self._lock:
+            series = self._histograms[name].setdefault(
+                view, {'buckets' : [0] * len(buckets), 'sum' : 0.0, 'count' : 0}
+            )
+
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    series['buckets'][index] += 1
+
+            series['sum']   += value
+            series['count'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            histograms = copy.deepcopy(self._histograms)
+
+        return {
+            'histograms' : histograms,
+            'counters'   : {name : source() for name, (help_text, source) in self._counters.items()},
+        }
+
+    def _snapshot_path(self, pid):
+        return Path(settings.METRICS_DIR) / f'{pid}.json'
+
+    def flush(self):
+        if not settings.METRICS_DIR:
+            return
+
+        os.makedirs(settings.METRICS_DIR, exist_ok = True)
+
+        with tempfile.NamedTemporaryFile('w', dir = settings.METRICS_DIR, suffix = '.tmp', delete = False) as file:
+            json.dump(self.snapshot(), file)
+
+        os.replace(file.name, self._snapshot_path(os.getpid()))
+        self._flushed_at = time.monotonic()
+
+    def maybe_flush(self):
+        if settings.METRICS_DIR and time.monotonic() - self._flushed_at >= settings.METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+    def collect(self):
+        snapshots = [self.snapshot()]
+
+        if settings.METRICS_DIR and os.path.isdir(settings.METRICS_DIR):
+            for path in Path(settings.METRICS_DIR).glob('*.json'):
+                if path == self._snapshot_path(os.getpid()):
+                    continue
+
+                try:
+                    snapshots.append(json.loads(path.read_text()))
+                except (OSError, ValueError):
+                    continue
+
+        merged = {'histograms' : {name : {} for name in HISTOGRAMS}, 'counters' : {}}
+
+        for snapshot in snapshots:
+            for name, views in snapshot['histograms'].items():
+                for view, series in views.items():
+                    total = merged['histograms'][name].setdefault(
+                        view, {'buckets' : [0] * len(series['buckets']), 'sum' : 0.0, 'count' : 0}
+                    )
+                    total['buckets'] = [a + b for a, b in zip(total['buckets'], series['buckets'])]
+                    total['sum']    += series['sum']
+                    total['count']  += series['count']
+
+            for name, value in snapshot['counters'].items():
+                merged['counters'][name] = merged['counters'].get(name, 0) + value
+
+        return merged
+
+    def render(self):
+        merged = self.collect()
+        lines  = []
+
+        for name, (help_text, buckets) in HISTOGRAMS.items():
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+
+            for view, series in sorted(merged['histograms'][name].items()):
+                label = f'view="{_escape(view)}"'
+
+                for bound, count in zip(buckets, series['buckets']):
+                    lines.append(f'{name}_bucket{{{label},le="{bound}"}} {count}')
+
+                lines += [
+                    f'{name}_bucket{{{label},le="+Inf"}} {series["count"]}',
+                    f'{name}_sum{{{label}}} {series["sum"]}',
+                    f'{name}_count{{{label}}} {series["count"]}',
+                ]
+
+        for name, (help_text, source) in self._counters.items():
+            lines += [
+                f'# HELP {name} {help_text}',
+                f'# TYPE {name} counter',
+                f'{name} {merged["counters"].get(name, 0)}',
+            ]
+
+        return '\n'.join(lines) + '\n'
+
+
+collector = Collector()
+
+atexit.register(collector.flush)
@@ -0,0 +1,91 @@
+import hashlib
+import time
+
+from urllib.parse import parse_qsl, urlencode
+
+from django.conf       import settings
+from django.core.cache import caches
+from django.http       import HttpResponse
+from django.utils.http import parse_http_date_safe
+
+from .http import not_modified
+
+
+# Anonymous GET responses are shared by every caller for MICROCACHE_TIMEOUT
+# seconds and may be served stale for MICROCACHE_STALE seconds more while one
+# request recomputes them. Keys carry a generation number, so purging is a
+# single incr no matter how many responses are cached.
+GENERATION_KEY = 'microcache:generation'
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+def _cache():
+    return caches[settings.MICROCACHE_ALIAS]
+
+
+def _generation():
+    generation = _cache().get(GENERATION_KEY)
+
+    if generation is None:
+        _cache().add(GENERATION_KEY, time.time_ns(), None)
+        generation = _cache().get(GENERATION_KEY)
+
+    return generation
+
+
+def purge_microcache():
+    try:
+        _cache().incr(GENERATION_KEY)
+    except ValueError:
+        _generation()
+
+
+def cache_key(request):
+    query = urlencode(sorted(parse_qsl(request.META.get('QUERY_STRING', ''), keep_blank_values = True)))
+    path  = hashlib.md5(f'{request.path}?{query}'.encode('utf-8')).hexdigest()
+
+    return f'microcache:{_generation()}:{path}'
+
+
+def get_entry(key):
+    return _cache().get(key)
+
+
+def store(key, response):
+    now   = time.time()
+    entry = {
+        'content'     : response.content,
+        'status'      : response.status_code,
+        'headers'     : {name : response[name] for name in CACHED_HEADERS if response.has_header(name)},
+        'fresh_until' : now + settings.MICROCACHE_TIMEOUT,
+    }
+
+    _cache().set(key, entry, settings.MICROCACHE_TIMEOUT + settings.MICROCACHE_STALE)
+
+
+def is_fresh(entry):
+    return time.time() < entry['fresh_until']
+
+
+def claim_refresh(key):
+    # Only the request that wins the add recomputes a stale entry; every
+    # other request keeps getting the stale copy in the meantime.
+    return _cache().add(f'{key}:refresh', True, settings.MICROCACHE_TIMEOUT)
+
+
+def respond(request, entry, state):
+    headers  = entry['headers']
+    response = None
+
+    if 'ETag' in headers:
+        response = not_modified(request, headers['ETag'], parse_http_date_safe(headers.get('Last-Modified', '')))
+
+    if response is None:
+        response = HttpResponse(entry['content'], status = entry['status'])
+
+        for name, value in headers.items():
+            response[name] = value
+
+    response['X-Cache'] = state
+
+    return response
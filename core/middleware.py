@@ -0,0 +1,240 @@
+import asyncio
+import contextlib
+import random
+import time
+import jwt
+
+from asgiref.sync           import async_to_sync, sync_to_async
+from django.conf            import settings
+from django.core.cache      import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db              import connections
+
+from .             import microcache
+from .cache      import KeyedLocks
+from .metrics    import QueryTimer, collector, timing_queries
+from .profiling  import check_token, profile_request
+from .routers    import end_request, is_pinned, pin_to_primary, start_request
+
+
+class AsyncCapableMiddleware:
+    # Under ASGI a sync-only middleware forces every request through the one
+    # thread-sensitive sync thread, so async views would queue behind it.
+    sync_capable  = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async     = asyncio.iscoroutinefunction(get_response)
+
+        # The marker Django 3.2's MiddlewareMixin sets, so the handler treats
+        # this instance as a coroutine function.
+        if self.is_async:
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.acall(request)
+
+        return self.call(request)
+
+
+class ProfilingMiddleware(AsyncCapableMiddleware):
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+
+        super().__init__(get_response)
+
+    def call(self, request):
+        if self.should_profile(request):
+            return profile_request(self.get_response, request)
+
+        return self.get_response(request)
+
+    async def acall(self, request):
+        if self.should_profile(request):
+            return await sync_to_async(profile_request)(async_to_sync(self.get_response), request)
+
+        return await self.get_response(request)
+
+    def should_profile(self, request):
+        return check_token(request.headers.get('X-Profile')) or random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    def call(self, request):
+        queries = QueryTimer()
+        started = time.perf_counter()
+
+        with contextlib.ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(queries))
+
+            response = self.get_response(request)
+
+        return self.record(request, response, queries, time.perf_counter() - started)
+
+    async def acall(self, request):
+        queries = QueryTimer()
+        started = time.perf_counter()
+
+        # The queries run on sync_to_async threads, whose connections this
+        # thread cannot wrap; the timer follows the request's context there.
+        with timing_queries(queries):
+            response = await self.get_response(request)
+
+        return self.record(request, response, queries, time.perf_counter() - started)
+
+    def record(self, request, response, queries, duration):
+        view = self.view_name(request)
+
+        collector.observe('wanted_request_duration_seconds', view, duration)
+        collector.observe('wanted_request_db_queries', view, queries.count)
+        collector.observe('wanted_request_db_duration_seconds', view, queries.duration)
+        collector.maybe_flush()
+
+        response['Server-Timing'] = (
+            f'app;dur={duration * 1000:.1f}, '
+            f'db;dur={queries.duration * 1000:.1f};desc="{queries.count} queries"'
+        )
+
+        return response
+
+    def view_name(self, request):
+        if getattr(request, 'microcache_hit', False):
+            return 'microcache'
+
+        match = getattr(request, 'resolver_match', None)
+
+        if match is None:
+            return 'unresolved'
+
+        view_class = getattr(match.func, 'view_class', None)
+
+        if view_class is None:
+            return match.func.__name__
+
+        return f'{view_class.__name__}.{request.method.lower()}'
+
+
+class ReplicaPinningMiddleware(AsyncCapableMiddleware):
+    def call(self, request):
+        token = self.start(request)
+
+        try:
+            response = self.get_response(request)
+            self.finish(request)
+
+            return response
+
+        finally:
+            end_request(token)
+
+    async def acall(self, request):
+        token = self.start(request)
+
+        try:
+            response = await self.get_response(request)
+            self.finish(request)
+
+            return response
+
+        finally:
+            end_request(token)
+
+    def start(self, request):
+        token   = start_request()
+        user_id = self.token_user_id(request)
+
+        if user_id and cache.get(self.pin_key(user_id)):
+            pin_to_primary()
+
+        return token
+
+    def finish(self, request):
+        user = getattr(request, 'user', None)
+
+        if is_pinned() and getattr(user, 'id', None):
+            cache.set(self.pin_key(user.id), True, settings.REPLICA_PIN_SECONDS)
+
+    def token_user_id(self, request):
+        access_token = request.headers.get('Authorization')
+
+        if not access_token:
+            return None
+
+        try:
+            return jwt.decode(access_token, settings.SECRET_KEY, algorithms = 'HS256').get('id')
+        except jwt.exceptions.InvalidTokenError:
+            return None
+
+    def pin_key(self, user_id):
+        return f'db:pinned:{user_id}'
+
+
+class MicroCacheMiddleware(AsyncCapableMiddleware):
+    def __init__(self, get_response):
+        if not settings.MICROCACHE_TIMEOUT:
+            raise MiddlewareNotUsed
+
+        super().__init__(get_response)
+        self.locks = KeyedLocks()
+
+    def call(self, request):
+        if not self.cacheable_request(request):
+            return self.get_response(request)
+
+        return self.serve(request, self.get_response)
+
+    async def acall(self, request):
+        if not self.cacheable_request(request):
+            return await self.get_response(request)
+
+        # Only cacheable reads take the sync hop the keyed lock needs.
+        return await sync_to_async(self.serve)(request, async_to_sync(self.get_response))
+
+    def serve(self, request, get_response):
+        key   = microcache.cache_key(request)
+        entry = microcache.get_entry(key)
+
+        if entry is not None and (microcache.is_fresh(entry) or not microcache.claim_refresh(key)):
+            request.microcache_hit = True
+
+            return microcache.respond(request, entry, 'HIT' if microcache.is_fresh(entry) else 'STALE')
+
+        if entry is not None:
+            return self.compute(request, key, get_response)
+
+        # A burst of misses for one key runs the view once per process; the
+        # requests queued behind the lock are answered from the new entry.
+        with self.locks(key):
+            entry = microcache.get_entry(key)
+
+            if entry is not None:
+                request.microcache_hit = True
+
+                return microcache.respond(request, entry, 'HIT')
+
+            return self.compute(request, key, get_response)
+
+    def compute(self, request, key, get_response):
+        response = get_response(request)
+
+        if self.cacheable_response(response):
+            microcache.store(key, response)
+
+        response['X-Cache'] = 'MISS'
+
+        return response
+
+    def cacheable_request(self, request):
+        return (
+            request.method == 'GET'
+            and 'Authorization' not in request.headers
+            and 'X-Profile' not in request.headers
+            and request.path.startswith(settings.MICROCACHE_PATHS)
+        )
+
+    def cacheable_response(self, response):
+        return response.status_code == 200 and not response.streaming and not response.cookies
@@ -0,0 +1,73 @@
+import contextlib
+import cProfile
+import json
+import os
+import time
+import uuid
+
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.db   import connections
+
+
+TOKEN_SALT = 'core.profiling'
+
+
+def make_token():
+    return signing.dumps('profile', salt = TOKEN_SALT)
+
+
+def check_token(token):
+    if not token:
+        return False
+
+    try:
+        return signing.loads(token, salt = TOKEN_SALT, max_age = settings.PROFILING_TOKEN_MAX_AGE) == 'profile'
+    except signing.BadSignature:
+        return False
+
+
+def profile_path(profile_id, suffix):
+    return Path(settings.PROFILING_DIR) / f'{profile_id}{suffix}'
+
+
+class QueryLog:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'sql'      : sql,
+                'params'   : [str(param) for param in params or ()] if not many else 'many',
+                'duration' : time.perf_counter() - started,
+            })
+
+
+def profile_request(get_response, request):
+    profiler = cProfile.Profile()
+    queries  = QueryLog()
+
+    with contextlib.ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(queries))
+
+        response = profiler.runcall(get_response, request)
+
+    profile_id = str(uuid.uuid4())
+
+    os.makedirs(settings.PROFILING_DIR, exist_ok = True)
+    profiler.dump_stats(profile_path(profile_id, '.prof'))
+
+    with open(profile_path(profile_id, '.sql.json'), 'w') as file:
+        json.dump({'method' : request.method, 'path' : request.get_full_path(), 'queries' : queries.queries}, file)
+
+    response['X-Profile-Id'] = profile_id
+
+    return response
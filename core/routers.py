@@ -0,0 +1,57 @@
+import contextvars
+
+from django.conf import settings
+from django.db   import DEFAULT_DB_ALIAS
+
+
+_pinned = contextvars.ContextVar('pinned_to_primary', default = False)
+
+
+def pin_to_primary():
+    _pinned.set(True)
+
+
+def is_pinned():
+    return _pinned.get()
+
+
+def start_request():
+    return _pinned.set(False)
+
+
+def end_request(token):
+    _pinned.reset(token)
+
+
+def primary():
+    return DEFAULT_DB_ALIAS
+
+
+def get_with_primary_fallback(queryset, **lookup):
+    try:
+        return queryset.get(**lookup)
+    except queryset.model.DoesNotExist:
+        if queryset.db == primary():
+            raise
+
+    # A replica can lag behind a row the caller created moments ago.
+    return queryset.using(primary()).get(**lookup)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if settings.REPLICA_DATABASE and not is_pinned():
+            return settings.REPLICA_DATABASE
+
+        return primary()
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+
+        return primary()
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name = None, **hints):
+        return db == primary()
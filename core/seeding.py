@@ -0,0 +1,111 @@
+import multiprocessing
+
+from collections        import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db        import connections, transaction
+from django.db.models import Max
+from django.utils     import timezone
+
+from posts.feed    import bump_feed
+from posts.models  import Post
+from posts.outbox  import create_outbox_triggers, suspend_outbox_triggers
+from posts.search  import resume_search_triggers, search_available, suspend_search_triggers
+from users.hashing import hash_password
+from users.models  import User
+from .             import fakedata
+from .microcache   import purge_microcache
+from .routers      import primary
+
+
+SEED_PASSWORD = 'seed123!!'
+
+
+def _insert(model, columns, rows, using):
+    quote = connections[using].ops.quote_name
+    sql   = (
+        f'INSERT INTO {quote(model._meta.db_table)} ({", ".join(quote(column) for column in columns)}) '
+        f'VALUES ({", ".join(["%s"] * len(columns))})'
+    )
+
+    with transaction.atomic(using = using), connections[using].cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def _generate(function, jobs, workers, initializer = None, initargs = ()):
+    if workers <= 1:
+        if initializer:
+            initializer(*initargs)
+
+        for job in jobs:
+            yield function(*job)
+
+        return
+
+    # Batches are generated in spawned workers and inserted here in order;
+    # at most two batches per worker are in flight to bound memory.
+    with ProcessPoolExecutor(
+        max_workers = workers,
+        mp_context  = multiprocessing.get_context('spawn'),
+        initializer = initializer,
+        initargs    = initargs,
+    ) as executor:
+        pending = deque()
+
+        for job in jobs:
+            pending.append(executor.submit(function, *job))
+
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def seed_users(count, batch_size, workers = 1, seed = 0):
+    using    = primary()
+    # bcrypt is deliberately slow, so every seeded user shares one hash.
+    password = hash_password(SEED_PASSWORD)
+    first    = (User.objects.using(using).aggregate(last = Max('id'))['last'] or 0) + 1
+    end      = timezone.now()
+    jobs     = (
+        (first + start, min(batch_size, count - start), password, end, seed + start)
+        for start in range(0, count, batch_size)
+    )
+
+    for rows in _generate(fakedata.generate_users, jobs, workers):
+        _insert(User, ['name', 'email', 'password', 'created_at', 'updated_at'], rows, using)
+
+
+def seed_posts(count, batch_size, workers = 1, seed = 0):
+    using   = primary()
+    authors = list(User.objects.using(using).values_list('id', 'name'))
+    end     = timezone.now()
+    jobs    = (
+        (start, min(batch_size, count - start), count, end, seed + start)
+        for start in range(0, count, batch_size)
+    )
+
+    if not authors:
+        raise ValueError('Posts need at least one user.')
+
+    # Rebuilding the search index once is much cheaper than firing the FTS
+    # triggers for every inserted row.
+    reindex = search_available(using)
+
+    if reindex:
+        suspend_search_triggers(using)
+
+    # Seeded rows are not changes anyone is following, so they get no events.
+    suspend_outbox_triggers(using)
+
+    try:
+        for rows in _generate(fakedata.generate_posts, jobs, workers, fakedata.set_authors, (authors,)):
+            _insert(Post, ['user_id', 'author', 'title', 'content', 'excerpt', 'created_at', 'updated_at'], rows, using)
+    finally:
+        if reindex:
+            resume_search_triggers(using)
+
+        create_outbox_triggers(using)
+        bump_feed()
+        purge_microcache()
@@ -1,3 +1,561 @@
-from django.test import TestCase
+import asyncio
+import contextvars
+import io
+import json
+import os
+import pstats
+import sqlite3
+import tempfile
+import threading
+import time
+import jwt
 
-# Create your tests here.
+from asgiref.sync              import async_to_sync, sync_to_async
+from django.conf               import settings
+from django.core.cache         import cache
+from django.core.exceptions    import MiddlewareNotUsed
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management    import call_command
+from django.db                 import connection, router
+from django.http               import HttpResponse
+from django.test               import AsyncClient, Client, SimpleTestCase, TestCase, TransactionTestCase, RequestFactory, override_settings
+
+from unittest.mock import patch
+
+from posts.models import Post
+from posts.search import search_posts
+from users.cache  import identity_cache_stats
+from users.models import User
+from .cache       import LocalLRUCache
+from .db          import apply_sqlite_pragmas
+from .management.commands.bench        import Command as BenchCommand
+from .management.commands.sync_replica import Command as SyncReplicaCommand
+from .metrics     import collector
+from .microcache  import cache_key, get_entry
+from .middleware  import MetricsMiddleware, MicroCacheMiddleware, ProfilingMiddleware, ReplicaPinningMiddleware
+from .profiling   import make_token, profile_path
+from .routers     import is_pinned
+from .seeding     import SEED_PASSWORD, seed_posts, seed_users
+
+class LocalLRUCacheTest(SimpleTestCase):
+    def test_local_lru_cache_evicts_least_recently_used(self):
+        lru = LocalLRUCache(max_size = 2, timeout = 60)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+
+        self.assertEqual(lru.get("a"), 1)
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual(lru.get("c"), 3)
+
+    def test_local_lru_cache_expires(self):
+        lru = LocalLRUCache(max_size = 2, timeout = 0.01)
+        lru.set("a", 1)
+        time.sleep(0.02)
+
+        self.assertIsNone(lru.get("a"))
+
+
+class SQLitePragmaTest(TestCase):
+    @override_settings(SQLITE_PRAGMAS = {'cache_size' : -4321})
+    def test_apply_sqlite_pragmas(self):
+        apply_sqlite_pragmas(sender = connection.__class__, connection = connection)
+
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA cache_size')
+
+            self.assertEqual(cursor.fetchone()[0], -4321)
+
+
+@override_settings(REPLICA_DATABASE = 'replica')
+class ReplicaRoutingTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def request(self, method, user_id, write = False, context = None):
+        context = context or contextvars.Context()
+        header = {"HTTP_AUTHORIZATION" : jwt.encode({'id' : user_id}, settings.SECRET_KEY, algorithm = "HS256")}
+        routed = []
+
+        def get_response(request):
+            routed.append(router.db_for_read(Post))
+
+            if write:
+                router.db_for_write(Post)
+                request.user = type("User", (), {"id" : user_id})()
+
+            return HttpResponse()
+
+        request = getattr(RequestFactory(), method)("/posts", **header)
+        context.run(ReplicaPinningMiddleware(get_response), request)
+
+        return routed[0]
+
+    def test_router_reads_from_replica(self):
+        self.assertEqual(contextvars.Context().run(router.db_for_read, Post), 'replica')
+
+    def test_router_pins_reads_after_write(self):
+        def write_then_read():
+            router.db_for_write(Post)
+            return router.db_for_read(Post)
+
+        self.assertEqual(contextvars.Context().run(write_then_read), 'default')
+
+    @override_settings(REPLICA_DATABASE = None)
+    def test_router_without_replica(self):
+        self.assertEqual(contextvars.Context().run(router.db_for_read, Post), 'default')
+
+    def test_middleware_read_your_writes(self):
+        self.request("post", 1, write = True)
+
+        self.assertEqual(self.request("get", 1), 'default')
+        self.assertEqual(self.request("get", 2), 'replica')
+
+    def test_middleware_does_not_leak_pin(self):
+        context = contextvars.Context()
+        self.request("post", 1, write = True, context = context)
+
+        self.assertFalse(context.run(is_pinned))
+
+    def test_middleware_read_your_writes_async(self):
+        header = {"HTTP_AUTHORIZATION" : jwt.encode({'id' : 1}, settings.SECRET_KEY, algorithm = "HS256")}
+
+        async def get_response(request):
+            await sync_to_async(router.db_for_write)(Post)
+            request.user = type("User", (), {"id" : 1})()
+
+            return HttpResponse()
+
+        middleware = ReplicaPinningMiddleware(get_response)
+        contextvars.Context().run(async_to_sync(middleware), RequestFactory().post("/posts", **header))
+
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        self.assertEqual(self.request("get", 1), 'default')
+
+    @override_settings(REPLICA_PIN_SECONDS = 0.01)
+    def test_middleware_pin_expires(self):
+        self.request("post", 1, write = True)
+        time.sleep(0.02)
+
+        self.assertEqual(self.request("get", 1), 'replica')
+
+
+class AsyncMiddlewareTest(SimpleTestCase):
+    @override_settings(DEBUG = True)
+    def adapted(self, middleware):
+        with self.settings(MIDDLEWARE = middleware), patch("django.core.handlers.base.logger") as logger:
+            ASGIHandler().load_middleware(is_async = True)
+
+        return [call.args[1] for call in logger.debug.call_args_list if 'adapted' in call.args[0]]
+
+    def test_replica_pinning_runs_async_under_asgi(self):
+        self.assertEqual(self.adapted(['core.middleware.ReplicaPinningMiddleware']), [])
+
+    def test_metrics_runs_async_under_asgi(self):
+        self.assertEqual(self.adapted(['core.middleware.MetricsMiddleware']), [])
+
+    def test_microcache_runs_async_under_asgi(self):
+        self.assertEqual(self.adapted(['core.middleware.MicroCacheMiddleware']), [])
+
+    @override_settings(PROFILING_ENABLED = True)
+    def test_middleware_stack_runs_async_under_asgi(self):
+        self.assertEqual(self.adapted(settings.MIDDLEWARE), [])
+
+
+class SyncReplicaTest(SimpleTestCase):
+    def test_sync_replica_copies_database(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source_name = os.path.join(directory, "default.sqlite3")
+            target_name = os.path.join(directory, "replica.sqlite3")
+
+            source = sqlite3.connect(source_name)
+            source.execute("CREATE TABLE posts (id INTEGER PRIMARY KEY, title TEXT)")
+            source.execute("INSERT INTO posts (title) VALUES ('테스트 1번')")
+            source.commit()
+            source.close()
+
+            SyncReplicaCommand().copy(source_name, target_name)
+
+            target = sqlite3.connect(target_name)
+
+            self.assertEqual(target.execute("SELECT title FROM posts").fetchall(), [("테스트 1번",)])
+
+            target.close()
+
+
+class MetricsTest(TestCase):
+    def setUp(self):
+        collector.reset()
+        user = User.objects.create(name = "wooju0", email = "zkzkxls@naver.com", password = "wooju123!@")
+        Post.objects.create(author = user.name, user = user, title = "테스트 1번", content = "테스트 1번 내용")
+
+    def test_server_timing_header(self):
+        response = Client().get("/posts/list?cursor=&limit=5")
+
+        self.assertRegex(response["Server-Timing"], r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="1 queries"$')
+
+    async def test_server_timing_header_async(self):
+        response = await AsyncClient().get("/posts/list?cursor=&limit=5")
+
+        self.assertRegex(response["Server-Timing"], r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="1 queries"$')
+
+    async def test_metrics_counts_queries_of_async_views(self):
+        async def get_response(request):
+            await sync_to_async(list)(Post.objects.all())
+
+            return HttpResponse()
+
+        response = await MetricsMiddleware(get_response)(RequestFactory().get("/posts"))
+
+        self.assertRegex(response["Server-Timing"], r'desc="1 queries"$')
+
+    def test_metrics_histograms_per_view(self):
+        client = Client()
+        client.get("/posts/list?cursor=&limit=5")
+        client.get("/posts/list?cursor=&limit=4")
+
+        body = client.get("/metrics").content.decode()
+
+        self.assertIn('wanted_request_duration_seconds_count{view="PostListView.get"} 2', body)
+        self.assertIn('wanted_request_db_queries_bucket{view="PostListView.get",le="0"} 0', body)
+        self.assertIn('wanted_request_db_queries_bucket{view="PostListView.get",le="1"} 2', body)
+        self.assertIn('# TYPE wanted_identity_cache_hits_total counter', body)
+
+    def test_metrics_merges_process_snapshots(self):
+        with tempfile.TemporaryDirectory() as directory, self.settings(METRICS_DIR = directory):
+            Client().get("/posts/list?cursor=&limit=5")
+            collector.flush()
+
+            with open(os.path.join(directory, "0.json"), "w") as file:
+                json.dump(collector.snapshot(), file)
+
+            body = Client().get("/metrics").content.decode()
+
+        self.assertIn('wanted_request_duration_seconds_count{view="PostListView.get"} 2', body)
+
+
+class MicroCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(name = "wooju0", email = "zkzkxls@naver.com", password = "wooju123!@")
+        Post.objects.create(author = self.user.name, user = self.user, title = "테스트 1번", content = "테스트 1번 내용")
+
+    def test_microcache_serves_anonymous_get_with_normalized_query(self):
+        client = Client()
+        first  = client.get("/posts/list?offset=0&limit=60")
+
+        with self.assertNumQueries(0):
+            second = client.get("/posts/list?limit=60&offset=0")
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_microcache_answers_conditional_get(self):
+        client = Client()
+        etag   = client.get("/posts/list?offset=0&limit=60")["ETag"]
+
+        response = client.get("/posts/list?offset=0&limit=60", HTTP_IF_NONE_MATCH = etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["X-Cache"], "HIT")
+
+    def test_microcache_purged_by_post_write(self):
+        client = Client()
+        client.get("/posts/list?offset=0&limit=60")
+        Post.objects.create(author = self.user.name, user = self.user, title = "테스트 2번", content = "테스트 2번 내용")
+
+        response = client.get("/posts/list?offset=0&limit=60")
+
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["count"], 2)
+
+    def test_microcache_skips_authenticated_requests(self):
+        token  = jwt.encode({'id' : self.user.id}, settings.SECRET_KEY, algorithm = "HS256")
+        client = Client()
+        client.get("/posts/list?offset=0&limit=60")
+
+        response = client.get("/posts/list?offset=0&limit=60", HTTP_AUTHORIZATION = token)
+
+        self.assertNotIn("X-Cache", response)
+
+    @override_settings(MICROCACHE_TIMEOUT = 0.05)
+    def test_microcache_serves_stale_while_one_request_refreshes(self):
+        client = Client()
+        key    = cache_key(RequestFactory().get("/posts/list?offset=0&limit=60"))
+        client.get("/posts/list?offset=0&limit=60")
+        time.sleep(0.1)
+
+        cache.set(f"{key}:refresh", True, 60)
+
+        with self.assertNumQueries(0):
+            stale = client.get("/posts/list?offset=0&limit=60")
+
+        cache.delete(f"{key}:refresh")
+        refreshed = client.get("/posts/list?offset=0&limit=60")
+
+        self.assertEqual(stale["X-Cache"], "STALE")
+        self.assertEqual(refreshed["X-Cache"], "MISS")
+        self.assertEqual(client.get("/posts/list?offset=0&limit=60")["X-Cache"], "HIT")
+
+    async def test_microcache_under_asgi(self):
+        client = AsyncClient()
+        first  = await client.get("/posts/list?offset=0&limit=60")
+        second = await client.get("/posts/list?limit=60&offset=0")
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.json(), first.json())
+
+    def test_microcache_single_flight_on_miss(self):
+        calls = []
+
+        def get_response(request):
+            calls.append(request)
+            time.sleep(0.05)
+
+            return HttpResponse("ok", content_type = "text/plain")
+
+        middleware = MicroCacheMiddleware(get_response)
+        responses  = []
+        threads    = [
+            threading.Thread(target = lambda: responses.append(middleware(RequestFactory().get("/posts/1"))))
+            for _ in range(5)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(response["X-Cache"] for response in responses), ["HIT"] * 4 + ["MISS"])
+        self.assertEqual(get_entry(cache_key(RequestFactory().get("/posts/1")))["content"], b"ok")
+
+
+class ProfilingTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        self.settings_override = self.settings(
+            PROFILING_ENABLED = True, PROFILING_SAMPLE_RATE = 0, PROFILING_DIR = directory.name
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def request(self, **headers):
+        middleware = ProfilingMiddleware(lambda request: HttpResponse(str(Post.objects.count())))
+
+        return middleware(RequestFactory().get("/posts/list", **headers))
+
+    @override_settings(PROFILING_ENABLED = False)
+    def test_profiling_disabled_is_not_installed(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ProfilingMiddleware(lambda request: HttpResponse())
+
+    def test_profiling_skips_unsigned_requests(self):
+        self.assertNotIn("X-Profile-Id", self.request(HTTP_X_PROFILE = "forged"))
+
+    def test_profiling_signed_request(self):
+        response   = self.request(HTTP_X_PROFILE = make_token())
+        profile_id = response["X-Profile-Id"]
+
+        self.assertGreater(pstats.Stats(str(profile_path(profile_id, ".prof"))).total_calls, 0)
+
+        with open(profile_path(profile_id, ".sql.json")) as file:
+            queries = json.load(file)["queries"]
+
+        self.assertEqual(len(queries), 1)
+        self.assertIn('FROM "posts"', queries[0]["sql"])
+
+    async def test_profiling_signed_request_async(self):
+        async def get_response(request):
+            return HttpResponse(str(await sync_to_async(Post.objects.count)()))
+
+        middleware = ProfilingMiddleware(get_response)
+        response   = await middleware(RequestFactory().get("/posts/list", HTTP_X_PROFILE = make_token()))
+
+        self.assertTrue(profile_path(response["X-Profile-Id"], ".prof").exists())
+
+    def test_profiling_sample_rate(self):
+        with self.settings(PROFILING_SAMPLE_RATE = 1):
+            self.assertIn("X-Profile-Id", self.request())
+
+    def test_profile_download_requires_token(self):
+        profile_id = self.request(HTTP_X_PROFILE = make_token())["X-Profile-Id"]
+        client     = Client()
+
+        self.assertEqual(client.get(f"/profiles/{profile_id}").status_code, 401)
+
+        response = client.get(f"/profiles/{profile_id}?format=sql", HTTP_X_PROFILE = make_token())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(b"".join(response.streaming_content))["path"], "/posts/list")
+
+
+@override_settings(BATCH_READ_WORKERS = 1)
+class BatchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user  = User.objects.create(name = "wooju0", email = "zkzkxls@naver.com", password = "wooju123!@")
+        self.post  = Post.objects.create(author = self.user.name, user = self.user, title = "테스트 1번", content = "테스트 1번 내용")
+        self.token = jwt.encode({'id' : self.user.id}, settings.SECRET_KEY, algorithm = "HS256")
+
+    def batch(self, items, **headers):
+        return Client().post("/batch", json.dumps(items), content_type = "application/json", **headers)
+
+    def test_batch_runs_sub_requests_in_order(self):
+        response = self.batch([
+            {"method" : "GET", "path" : f"/posts/{self.post.id}"},
+            {"method" : "GET", "path" : "/posts/list?offset=0&limit=5"},
+            {"method" : "PUT", "path" : f"/posts/{self.post.id}", "body" : {"title" : "수정", "content" : "수정 내용"}},
+            {"method" : "GET", "path" : f"/posts/{self.post.id}"},
+            {"method" : "GET", "path" : "/posts/999"},
+            {"method" : "GET", "path" : "/posts/nowhere/1"},
+        ], HTTP_AUTHORIZATION = self.token)
+
+        result = response.json()["RESULT"]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["status"] for item in result], [200, 200, 201, 200, 404, 404])
+        self.assertEqual(result[0]["body"]["RESULT"]["title"], "테스트 1번")
+        self.assertEqual(result[1]["body"]["total"], 1)
+        self.assertEqual(result[3]["body"]["RESULT"]["title"], "수정")
+        self.assertEqual(result[5]["body"], {"MESSAGE" : "NOT_FOUND"})
+
+    def test_batch_resolves_identity_once(self):
+        before = identity_cache_stats()
+
+        response = self.batch([
+            {"method" : "POST", "path" : "/posts", "body" : {"title" : f"테스트 {number}번", "content" : "내용"}}
+            for number in range(3)
+        ], HTTP_AUTHORIZATION = self.token)
+
+        after = identity_cache_stats()
+
+        self.assertEqual([item["status"] for item in response.json()["RESULT"]], [201, 201, 201])
+        self.assertEqual(after["hits"] + after["misses"] - before["hits"] - before["misses"], 1)
+
+    def test_batch_without_token(self):
+        response = self.batch([
+            {"method" : "GET", "path" : f"/posts/{self.post.id}"},
+            {"method" : "DELETE", "path" : f"/posts/{self.post.id}"},
+        ])
+
+        self.assertEqual([item["status"] for item in response.json()["RESULT"]], [200, 401])
+        self.assertTrue(Post.objects.filter(id = self.post.id).exists())
+
+    def test_batch_pins_writer_to_primary(self):
+        self.batch([{"method" : "DELETE", "path" : f"/posts/{self.post.id}"}], HTTP_AUTHORIZATION = self.token)
+
+        self.assertTrue(cache.get(f"db:pinned:{self.user.id}"))
+
+    def test_batch_expired_token(self):
+        token    = jwt.encode({'id' : self.user.id, 'exp' : int(time.time()) - 60}, settings.SECRET_KEY, algorithm = "HS256")
+        response = self.batch([{"method" : "GET", "path" : f"/posts/{self.post.id}"}], HTTP_AUTHORIZATION = token)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["status"] for item in response.json()["RESULT"]], [200])
+
+    def test_batch_invalid_items(self):
+        response = self.batch([
+            {"method" : "GET", "path" : "/metrics"},
+            {"method" : "HEAD", "path" : "/posts/1"},
+            {"path" : "/posts/1"},
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"MESSAGE" : "INVALID_ITEMS", "ERRORS" : [
+            {"index" : 0, "MESSAGE" : "UNSUPPORTED_PATH"},
+            {"index" : 1, "MESSAGE" : "METHOD_NOT_ALLOWED"},
+            {"index" : 2, "MESSAGE" : "KEY_ERROR"},
+        ]})
+
+    def test_batch_limits(self):
+        self.assertEqual(self.batch({"method" : "GET"}).json(), {"MESSAGE" : "VALUE_ERROR"})
+
+        with self.settings(BATCH_MAX_REQUESTS = 1):
+            response = self.batch([{"method" : "GET", "path" : "/posts/1"}] * 2)
+
+        self.assertEqual(response.json(), {"MESSAGE" : "TOO_MANY_REQUESTS"})
+
+    def test_batch_streaming_sub_request(self):
+        result = self.batch([{"method" : "GET", "path" : "/posts/export"}]).json()["RESULT"]
+
+        self.assertEqual(result, [{"status" : 400, "body" : {"MESSAGE" : "STREAMING_NOT_SUPPORTED"}}])
+
+
+@override_settings(BATCH_READ_WORKERS = 4)
+class BatchConcurrencyTest(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        user       = User.objects.create(name = "wooju0", email = "zkzkxls@naver.com", password = "wooju123!@")
+        self.posts = [
+            Post.objects.create(author = user.name, user = user, title = f"테스트 {number}번", content = "내용")
+            for number in range(5)
+        ]
+
+    def test_batch_reads_run_on_pool(self):
+        items    = [{"method" : "GET", "path" : f"/posts/{post.id}"} for post in self.posts]
+        response = Client().post("/batch", json.dumps(items), content_type = "application/json")
+
+        self.assertEqual(
+            [item["body"]["RESULT"]["title"] for item in response.json()["RESULT"]],
+            [post.title for post in self.posts],
+        )
+
+
+class SeedTest(TestCase):
+    def test_seed_batches(self):
+        seed_users(3, batch_size = 2)
+        seed_posts(5, batch_size = 2)
+
+        self.assertEqual(User.objects.count(), 3)
+        self.assertEqual(Post.objects.count(), 5)
+        self.assertEqual(set(Post.objects.values_list("author", flat = True)) - set(User.objects.values_list("name", flat = True)), set())
+        self.assertEqual(list(Post.objects.order_by("created_at").values_list("id", flat = True)), list(Post.objects.order_by("id").values_list("id", flat = True)))
+
+    def test_seed_users_can_sign_in(self):
+        seed_users(1, batch_size = 1)
+
+        response = Client().post(
+            "/users/sign-in",
+            json.dumps({"email" : User.objects.get().email, "password" : SEED_PASSWORD}),
+            content_type = "application/json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+
+    def test_seed_command_with_workers_rebuilds_search_index(self):
+        call_command("seed", users = 2, posts = 20, batch_size = 7, workers = 2, stdout = io.StringIO())
+
+        self.assertEqual(Post.objects.count(), 20)
+        post = Post.objects.first()
+
+        self.assertIn(post.id, [hit.id for hit in search_posts(post.content, 20)])
+
+        post = Post.objects.create(user = post.user, author = post.author, title = "시드 이후 작성", content = "트리거 복구 확인")
+
+        self.assertEqual([hit.id for hit in search_posts("트리거 복구", 20)], [post.id])
+
+
+class BenchTest(SimpleTestCase):
+    def test_bench_compare_flags_regressions(self):
+        baseline = {"scenarios" : {
+            "PostView.get"     : {"p95_ms" : 10, "queries_per_request" : 1},
+            "PostListView.get" : {"p95_ms" : 10, "queries_per_request" : 1},
+        }}
+        report   = {"scenarios" : {
+            "PostView.get"     : {"p95_ms" : 11, "queries_per_request" : 1},
+            "PostListView.get" : {"p95_ms" : 10, "queries_per_request" : 2},
+            "SignInView.post"  : {"p95_ms" : 300, "queries_per_request" : 1},
+        }}
+
+        comparison = BenchCommand().compare(baseline, report, threshold = 0.2)
+
+        self.assertEqual(comparison["regressions"], ["PostListView.get"])
+        self.assertEqual(comparison["scenarios"]["PostView.get"]["p95_change"], 0.1)
@@ -1,3 +1,89 @@
-from django.shortcuts import render
+import asyncio
+import functools
+import json
+import jwt
 
-# Create your views here.
+from django.conf  import settings
+from django.http  import FileResponse, HttpResponse, JsonResponse
+from django.views import View
+
+from users.decorators import authenticate
+from users.models     import User
+from .batch           import run_batch, validate
+from .metrics         import collector
+from .profiling       import check_token, profile_path
+
+
+class AsyncView(View):
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+
+        # Only the handlers subclasses write are coroutines; the inherited
+        # http_method_not_allowed and options return plain responses.
+        async def async_view(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+
+            if asyncio.iscoroutine(response):
+                response = await response
+
+            return response
+
+        return functools.update_wrapper(async_view, view)
+
+class MetricsView(View):
+    def get(self, request):
+        return HttpResponse(collector.render(), content_type = 'text/plain; version=0.0.4; charset=utf-8')
+
+class ProfileView(View):
+    def get(self, request, profile_id):
+        if not check_token(request.headers.get('X-Profile')):
+            return JsonResponse({'MESSAGE' : 'INVALID_TOKEN'}, status = 401)
+
+        suffix = '.sql.json' if request.GET.get('format') == 'sql' else '.prof'
+        path   = profile_path(profile_id, suffix)
+
+        if not path.exists():
+            return JsonResponse({'MESSAGE' : 'DOSE_NOT_EXIST_PROFILE'}, status = 404)
+
+        return FileResponse(open(path, 'rb'), as_attachment = True, filename = path.name)
+
+class BatchView(View):
+    def post(self, request):
+        try:
+            items = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({'MESSAGE' : 'VALUE_ERROR'}, status = 400)
+
+        if not isinstance(items, list):
+            return JsonResponse({'MESSAGE' : 'VALUE_ERROR'}, status = 400)
+
+        if len(items) > settings.BATCH_MAX_REQUESTS:
+            return JsonResponse({'MESSAGE' : 'TOO_MANY_REQUESTS'}, status = 400)
+
+        errors = []
+
+        for index, item in enumerate(items):
+            error = validate(item)
+
+            if error:
+                errors.append({'index' : index, 'MESSAGE' : error})
+
+        if errors:
+            return JsonResponse({'MESSAGE' : 'INVALID_ITEMS', 'ERRORS' : errors}, status = 400)
+
+        user = self.identity(request)
+
+        # ReplicaPinningMiddleware pins the caller after a write by looking at
+        # the outer request, so it needs the identity too.
+        if user is not None:
+            request.user = user
+
+        return JsonResponse({'RESULT' : run_batch(request, items, user)}, status = 200)
+
+    def identity(self, request):
+        # Sub-requests without a valid token fail in login_decorator as usual.
+        try:
+            return authenticate(request)
+        except (jwt.exceptions.InvalidTokenError, User.DoesNotExist):
+            return None
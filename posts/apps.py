@@ -1,6 +1,22 @@
-from django.apps import AppConfig
+from django.apps              import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def create_triggers_after_migrate(sender, using, **kwargs):
+    from .counters import create_counter_triggers
+    from .outbox   import create_outbox_triggers
+    from .search   import create_search_index
+
+    create_search_index(using)
+    create_counter_triggers(using)
+    create_outbox_triggers(using)
 
 
 class PostsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'posts'
+
+    def ready(self):
+        from . import signals
+
+        post_migrate.connect(create_triggers_after_migrate, sender = self)
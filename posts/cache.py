@@ -0,0 +1,183 @@
+import time
+
+from django.conf       import settings
+from django.core.cache import caches
+
+from core.cache   import KeyedLocks, LocalLRUCache
+from core.http    import make_etag
+from core.routers import primary
+from .models      import Post
+
+
+_local   = LocalLRUCache(settings.POST_CACHE_LOCAL_SIZE, settings.POST_CACHE_LOCAL_TIMEOUT)
+_loading = KeyedLocks()
+
+
+def _shared_cache():
+    return caches[settings.POST_CACHE_ALIAS]
+
+
+def _post_key(post_id):
+    return f'posts:post:{post_id}'
+
+
+# Every post has a version stamp that invalidate_post bumps. A fill records
+# the stamp it read before querying, so a fill that raced a write stores an
+# entry with an old stamp, which readers then treat as a miss instead of
+# serving it (and its ETag) for POST_CACHE_TIMEOUT.
+def _version_key(post_id):
+    return f'posts:post:{post_id}:version'
+
+
+def _versions(post_ids):
+    keys     = {_version_key(post_id) : post_id for post_id in post_ids}
+    versions = {keys[key] : version for key, version in _shared_cache().get_many(keys).items()}
+
+    for post_id in post_ids:
+        if post_id not in versions:
+            # Seeded from the clock so an evicted stamp never matches again.
+            _shared_cache().add(_version_key(post_id), time.time_ns(), None)
+            versions[post_id] = _shared_cache().get(_version_key(post_id))
+
+    return versions
+
+
+def _current(entry, version):
+    return entry is not None and entry['version'] == version
+
+
+def _cached(post_id):
+    key   = _post_key(post_id)
+    entry = _local.get(key)
+
+    if entry is None:
+        shared = _shared_cache().get_many([key, _version_key(post_id)])
+        entry  = shared.get(key)
+
+        if not _current(entry, shared.get(_version_key(post_id))):
+            return None
+
+        _local.set(key, entry)
+
+    return entry
+
+
+def post_validators(post_id, updated_at):
+    return make_etag(post_id, updated_at.isoformat()), int(updated_at.timestamp())
+
+
+def page_etag(rows, total = None):
+    parts = [f'{post_id}@{updated_at.isoformat()}' for post_id, updated_at in rows]
+
+    if total is not None:
+        parts.append(f'total={total}')
+
+    return make_etag(*parts)
+
+
+# Cache fills read from the primary so that a lagging replica cannot put a
+# row that was just invalidated back into the cache.
+def _post_entry(post, version):
+    etag, last_modified = post_validators(post.id, post.updated_at)
+
+    return {'result' : post.to_dict(), 'etag' : etag, 'last_modified' : last_modified, 'version' : version}
+
+
+def _load_post(post_id, version):
+    try:
+        return _post_entry(Post.objects.using(primary()).get(id = post_id), version)
+    except Post.DoesNotExist:
+        return None
+
+
+def get_post(post_id):
+    key   = _post_key(post_id)
+    entry = _cached(post_id)
+
+    if entry is not None:
+        return entry
+
+    with _loading(key):
+        entry = _cached(post_id)
+
+        if entry is not None:
+            return entry
+
+        entry = _load_post(post_id, _versions([post_id])[post_id])
+
+        # Not kept locally yet: the next read checks the stamp first, in case
+        # a write landed while this fill was running.
+        if entry is not None:
+            _shared_cache().set(key, entry, settings.POST_CACHE_TIMEOUT)
+
+        return entry
+
+
+def get_posts(post_ids):
+    entries = {}
+    missing = []
+
+    for post_id in post_ids:
+        entry = _local.get(_post_key(post_id))
+
+        if entry is None:
+            missing.append(post_id)
+        else:
+            entries[post_id] = entry
+
+    if missing:
+        shared = _shared_cache().get_many(
+            [_post_key(post_id) for post_id in missing] + [_version_key(post_id) for post_id in missing]
+        )
+
+        for post_id in missing:
+            entry = shared.get(_post_key(post_id))
+
+            if _current(entry, shared.get(_version_key(post_id))):
+                entries[post_id] = entry
+                _local.set(_post_key(post_id), entry)
+
+        missing = [post_id for post_id in missing if post_id not in entries]
+
+    if missing:
+        versions = _versions(missing)
+        loaded   = {
+            post.id : _post_entry(post, versions[post.id])
+            for post in Post.objects.using(primary()).filter(id__in = missing)
+        }
+
+        _shared_cache().set_many(
+            {_post_key(post_id) : entry for post_id, entry in loaded.items()}, settings.POST_CACHE_TIMEOUT
+        )
+
+        entries.update(loaded)
+
+    return entries
+
+
+def get_post_validators(post_id):
+    entry = _cached(post_id)
+
+    if entry is not None:
+        return entry['etag'], entry['last_modified']
+
+    updated_at = Post.objects.filter(id = post_id).values_list('updated_at', flat = True).first()
+
+    if updated_at is not None:
+        return post_validators(post_id, updated_at)
+
+
+def invalidate_post(post_id):
+    key = _post_key(post_id)
+
+    try:
+        _shared_cache().incr(_version_key(post_id))
+    except ValueError:
+        _versions([post_id])
+
+    _local.delete(key)
+    _shared_cache().delete(key)
+
+
+def clear_local():
+    _local.clear()
@@ -0,0 +1,81 @@
+from django.db        import connections, transaction
+from django.db.models import Count, Subquery
+
+from .models import Post, PostCount
+
+
+GLOBAL_SCOPE = 'all'
+
+# post_counts is kept in step with posts by triggers, so every write path
+# (views, bulk_create, raw deletes, cascades, raw inserts) updates the
+# counters inside its own transaction without extra round trips.
+SCHEMA = [
+    """
+    CREATE TRIGGER IF NOT EXISTS post_counts_insert AFTER INSERT ON posts BEGIN
+        INSERT INTO post_counts(scope, count) VALUES ('all', 1), ('user:' || new.user_id, 1)
+        ON CONFLICT(scope) DO UPDATE SET count = count + excluded.count;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS post_counts_delete AFTER DELETE ON posts BEGIN
+        UPDATE post_counts SET count = count - 1 WHERE scope IN ('all', 'user:' || old.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS post_counts_update AFTER UPDATE OF user_id ON posts BEGIN
+        UPDATE post_counts SET count = count - 1 WHERE scope = 'user:' || old.user_id;
+        INSERT INTO post_counts(scope, count) VALUES ('user:' || new.user_id, 1)
+        ON CONFLICT(scope) DO UPDATE SET count = count + 1;
+    END
+    """,
+]
+
+
+def user_scope(user_id):
+    return f'user:{user_id}'
+
+
+def _has_counter_triggers(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'post_counts_insert'")
+
+        return cursor.fetchone() is not None
+
+
+def create_counter_triggers(using = 'default'):
+    connection = connections[using]
+
+    if connection.vendor != 'sqlite' or _has_counter_triggers(connection):
+        return False
+
+    with transaction.atomic(using = using):
+        with connection.cursor() as cursor:
+            for statement in SCHEMA:
+                cursor.execute(statement)
+
+        recount_posts(using)
+
+    return True
+
+
+def recount_posts(using = 'default'):
+    with transaction.atomic(using = using):
+        PostCount.objects.using(using).all().delete()
+
+        counts = [
+            PostCount(scope = user_scope(row['user_id']), count = row['count'])
+            for row in Post.objects.using(using).values('user_id').annotate(count = Count('id')).order_by()
+        ]
+        counts.append(PostCount(scope = GLOBAL_SCOPE, count = sum(counter.count for counter in counts)))
+
+        PostCount.objects.using(using).bulk_create(counts)
+
+    return counts[-1].count
+
+
+def with_total(posts, scope):
+    return posts.annotate(total = Subquery(PostCount.objects.filter(scope = scope).values('count')[:1]))
+
+
+def get_total(scope):
+    return PostCount.objects.filter(scope = scope).values_list('count', flat = True).first() or 0
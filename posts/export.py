@@ -0,0 +1,90 @@
+import datetime
+import json
+
+from urllib.parse import parse_qsl
+
+from asgiref.sync                 import sync_to_async
+from django.conf                  import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models             import Q
+from django.utils                 import timezone
+
+from .models import Post
+from .stream import cors_headers, send_json
+
+
+FIELDS = ['id', 'user_id', 'author', 'title', 'content', 'created_at', 'updated_at']
+
+
+def parse_since(value):
+    since = datetime.datetime.fromisoformat(value) if value else None
+
+    # Stored datetimes are naive local time (USE_TZ = False); an offset has
+    # to be resolved here, before the 200 goes out.
+    if since and timezone.is_aware(since):
+        since = timezone.make_naive(since)
+
+    return since
+
+
+def fetch_chunk(since, last = None):
+    posts = Post.objects.order_by('updated_at', 'id').values(*FIELDS)
+
+    if since:
+        posts = posts.filter(updated_at__gte = since)
+
+    if last:
+        posts = posts.filter(
+            Q(updated_at__gt = last['updated_at']) | Q(updated_at = last['updated_at'], id__gt = last['id'])
+        )
+
+    return list(posts[:settings.POST_EXPORT_CHUNK_SIZE])
+
+
+def render(chunk):
+    return ''.join(json.dumps(post, cls = DjangoJSONEncoder, ensure_ascii = False) + '\n' for post in chunk)
+
+
+def export_chunks(since):
+    chunk = fetch_chunk(since)
+
+    while chunk:
+        yield render(chunk)
+
+        if len(chunk) < settings.POST_EXPORT_CHUNK_SIZE:
+            break
+
+        chunk = fetch_chunk(since, chunk[-1])
+
+
+# Under ASGI Django 3.2 would iterate the view's generator in async context,
+# where the ORM refuses to run, so wanted/asgi.py serves /posts/export here
+# with every chunk fetched through sync_to_async.
+async def export_posts(scope, receive, send):
+    if scope['method'] != 'GET':
+        return await send_json(send, {'MESSAGE' : 'METHOD_NOT_ALLOWED'}, 405)
+
+    query = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1')))
+
+    try:
+        since = parse_since(query.get('since'))
+    except ValueError:
+        return await send_json(send, {'MESSAGE' : 'INVALID_SINCE'}, 400)
+
+    await send({
+        'type'    : 'http.response.start',
+        'status'  : 200,
+        'headers' : [(b'content-type', b'application/x-ndjson')] + cors_headers(scope),
+    })
+
+    chunk = await sync_to_async(fetch_chunk)(since)
+
+    while chunk:
+        await send({'type' : 'http.response.body', 'body' : render(chunk).encode('utf-8'), 'more_body' : True})
+
+        if len(chunk) < settings.POST_EXPORT_CHUNK_SIZE:
+            break
+
+        chunk = await sync_to_async(fetch_chunk)(since, chunk[-1])
+
+    await send({'type' : 'http.response.body', 'body' : b''})
@@ -0,0 +1,109 @@
+import threading
+import time
+
+from django.conf       import settings
+from django.core.cache import caches
+
+from core.routers import primary
+from .counters    import GLOBAL_SCOPE, get_total, with_total
+from .models      import Post
+
+
+# The first POST_FEED_SIZE posts of /posts/list, serialized, shared through
+# the post cache and copied into each process. Every write bumps the
+# version stamp after it commits; a snapshot is only served while its
+# version matches the current stamp, otherwise the page is rebuilt from
+# the database with one query. The per-process copy is also dropped after
+# POST_CACHE_LOCAL_TIMEOUT seconds, so a process that never sees the stamp
+# move (a per-process cache backend) still picks up other workers' writes
+# once the shared snapshot expires.
+FEED_KEY         = 'posts:feed'
+FEED_VERSION_KEY = 'posts:feed:version'
+
+_local      = {'version' : None, 'feed' : None, 'expires' : 0}
+_local_lock = threading.Lock()
+
+
+def _shared_cache():
+    return caches[settings.POST_CACHE_ALIAS]
+
+
+def _current_version():
+    version = _shared_cache().get(FEED_VERSION_KEY)
+
+    if version is None:
+        # Seed with the clock rather than 1 so that a snapshot left over from
+        # before the stamp was evicted can never match again.
+        _shared_cache().add(FEED_VERSION_KEY, time.time_ns(), None)
+        version = _shared_cache().get(FEED_VERSION_KEY)
+
+    return version
+
+
+def _entry(post):
+    return dict(post.to_dict(Post.LIST_FIELDS), updated_at = post.updated_at)
+
+
+def get_feed():
+    version = _current_version()
+
+    with _local_lock:
+        if _local['version'] == version and time.monotonic() < _local['expires']:
+            return _local['feed']
+
+    feed = _shared_cache().get(FEED_KEY)
+
+    if feed is None or feed['version'] != version:
+        feed = load_feed(version)
+
+    with _local_lock:
+        _local.update(version = version, feed = feed, expires = time.monotonic() + settings.POST_CACHE_LOCAL_TIMEOUT)
+
+    return feed
+
+
+def load_feed(version):
+    posts = list(
+        with_total(Post.objects.using(primary()).order_by('created_at', 'id'), GLOBAL_SCOPE)[:settings.POST_FEED_SIZE]
+    )
+    feed  = {
+        'version' : version,
+        'posts'   : [_entry(post) for post in posts],
+        'total'   : posts[0].total or 0 if posts else get_total(GLOBAL_SCOPE),
+    }
+
+    _shared_cache().set(FEED_KEY, feed, settings.POST_FEED_TIMEOUT)
+
+    return feed
+
+
+def bump_feed():
+    try:
+        return _shared_cache().incr(FEED_VERSION_KEY)
+    except ValueError:
+        _current_version()
+
+
+def patch_feed(post_id, **changes):
+    version = bump_feed()
+    feed    = _shared_cache().get(FEED_KEY)
+
+    # Only a snapshot of exactly the previous version can be moved forward;
+    # if another write got in between, readers rebuild instead.
+    if version is None or feed is None or feed['version'] != version - 1:
+        return
+
+    posts = []
+
+    for post in feed['posts']:
+        if post['id'] == post_id:
+            # Two writes to one post can bump the stamp in the opposite order
+            # to their commits; never let the older one overwrite the newer.
+            if post['updated_at'] >= changes['updated_at']:
+                return
+
+            post = dict(post, **changes)
+
+        posts.append(post)
+
+    _shared_cache().set(FEED_KEY, dict(feed, version = version, posts = posts), settings.POST_FEED_TIMEOUT)
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db                   import DEFAULT_DB_ALIAS, transaction
+
+from core.microcache import purge_microcache
+from posts.feed      import bump_feed
+from posts.models    import Post
+from posts.text      import make_excerpt
+
+
+class Command(BaseCommand):
+    help = 'Fills posts.excerpt for rows written before the column existed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default = DEFAULT_DB_ALIAS)
+        parser.add_argument('--batch-size', type = int, default = 1000)
+
+    def handle(self, *args, **options):
+        using   = options['database']
+        posts   = Post.objects.using(using).filter(excerpt = '').exclude(content = '').only('id', 'content')
+        last_id = 0
+        total   = 0
+
+        while True:
+            batch = list(posts.filter(id__gt = last_id).order_by('id')[:options['batch_size']])
+
+            if not batch:
+                break
+
+            for post in batch:
+                post.excerpt = make_excerpt(post.content)
+
+            # bulk_update leaves updated_at alone, so ETags stay valid.
+            with transaction.atomic(using = using):
+                Post.objects.using(using).bulk_update(batch, ['excerpt'])
+
+            last_id  = batch[-1].id
+            total   += len(batch)
+
+        bump_feed()
+        purge_microcache()
+
+        self.stdout.write(self.style.SUCCESS(f'Backfilled {total} excerpts on "{using}".'))
@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from django.conf                 import settings
+from django.core.management.base import BaseCommand
+from django.db                   import DEFAULT_DB_ALIAS, connections
+from django.utils                import timezone
+
+from posts.models import PostEvent
+
+
+class Command(BaseCommand):
+    help = 'Deletes post_events rows older than the retention window.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default = DEFAULT_DB_ALIAS)
+        parser.add_argument('--days', type = int, default = settings.POST_EVENTS_RETENTION_DAYS)
+
+    def handle(self, *args, **options):
+        using      = options['database']
+        cutoff     = timezone.now() - timedelta(days = options['days'])
+        connection = connections[using]
+
+        # One DELETE statement; QuerySet.delete() would load every expired
+        # row first, and nothing hangs off post_events.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {PostEvent._meta.db_table} WHERE created_at < %s',
+                [connection.ops.adapt_datetimefield_value(cutoff)],
+            )
+            deleted = cursor.rowcount
+
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} post events on "{using}".'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db                   import DEFAULT_DB_ALIAS, connections
+
+from posts.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Drops and rebuilds the posts_fts full-text index from the posts table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default = DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options['database']
+
+        if connections[using].vendor != 'sqlite':
+            raise CommandError('Full-text search is only available on SQLite.')
+
+        rebuild_search_index(using)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt posts_fts on "{using}".'))
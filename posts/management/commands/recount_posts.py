@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db                   import DEFAULT_DB_ALIAS, connections
+
+from core.microcache import purge_microcache
+from posts.counters  import create_counter_triggers, recount_posts
+from posts.feed      import bump_feed
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the global and per-user post_counts rows from the posts table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default = DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options['database']
+
+        if connections[using].vendor != 'sqlite':
+            raise CommandError('Post counters are maintained by SQLite triggers.')
+
+        create_counter_triggers(using)
+        total = recount_posts(using)
+
+        bump_feed()
+        purge_microcache()
+
+        self.stdout.write(self.style.SUCCESS(f'Recounted {total} posts on "{using}".'))
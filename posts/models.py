@@ -3,13 +3,72 @@ from django.db.models.deletion import CASCADE
 
 from core.models  import TimeStamp
 from users.models import User
+from .text        import EXCERPT_LENGTH, make_excerpt
+
+
+class PostQuerySet(models.QuerySet):
+    # bulk_create skips save(), so the excerpt is filled here as well.
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+
+        for post in objs:
+            post.excerpt = make_excerpt(post.content)
+
+        return super().bulk_create(objs, *args, **kwargs)
 
 
 class Post(TimeStamp):
     author  = models.CharField(max_length = 16)
     title   = models.CharField(max_length = 200)
     content = models.TextField()
-    user    = models.ForeignKey(User, on_delete = models.CASCADE)
+    excerpt = models.CharField(max_length = EXCERPT_LENGTH + 1, default = '')
+    # posts_user_created_at_id_idx leads with user_id and replaces the FK index.
+    user    = models.ForeignKey(User, on_delete = models.CASCADE, db_index = False)
+
+    objects = PostQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'posts'
+        indexes  = [
+            models.Index(fields = ['created_at', 'id'], name = 'posts_created_at_id_idx'),
+            models.Index(fields = ['updated_at', 'id'], name = 'posts_updated_at_id_idx'),
+            models.Index(fields = ['user', 'created_at', 'id'], name = 'posts_user_created_at_id_idx'),
+        ]
+
+    DEFAULT_FIELDS = ('author', 'title', 'content', 'created_at')
+    LIST_FIELDS    = ('id', 'author', 'title', 'content', 'excerpt', 'created_at')
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+
+        if 'content' not in self.get_deferred_fields():
+            self.excerpt = make_excerpt(self.content)
+
+            if update_fields is not None and 'content' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'excerpt'}
+
+        super().save(*args, **kwargs)
+
+    def to_dict(self, fields = DEFAULT_FIELDS):
+        return {
+            field : self.created_at.strftime('%Y-%m-%d %H:%M:%S') if field == 'created_at' else getattr(self, field)
+            for field in fields
+        }
+
+
+class PostCount(models.Model):
+    scope = models.CharField(max_length = 32, primary_key = True)
+    count = models.BigIntegerField(default = 0)
+
+    class Meta:
+        db_table = 'post_counts'
+
+
+class PostEvent(models.Model):
+    post_id    = models.BigIntegerField()
+    action     = models.CharField(max_length = 8)
+    payload    = models.JSONField()
+    created_at = models.DateTimeField()
 
     class Meta:
-        db_table = 'posts'
\ No newline at end of file
+        db_table = 'post_events'
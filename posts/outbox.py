@@ -0,0 +1,74 @@
+from django.db import connections, transaction
+
+from .models import PostEvent
+
+
+# post_events is an outbox of post changes written by triggers, so every write
+# path (views, bulk_create, queryset updates, raw deletes, cascades) records
+# its event in the same transaction as the change itself. The autoincrement
+# id is the SSE event id served by /posts/stream.
+PAYLOAD = """
+    json_object(
+        'id', new.id, 'user_id', new.user_id, 'author', new.author, 'title', new.title, 'excerpt', new.excerpt,
+        'created_at', substr(new.created_at, 1, 19), 'updated_at', substr(new.updated_at, 1, 19)
+    )
+"""
+
+SCHEMA = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS post_events_insert AFTER INSERT ON posts BEGIN
+        INSERT INTO post_events(post_id, action, payload, created_at)
+        VALUES (new.id, 'created', {PAYLOAD}, datetime('now', 'localtime'));
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS post_events_update AFTER UPDATE OF user_id, author, title, content, excerpt ON posts BEGIN
+        INSERT INTO post_events(post_id, action, payload, created_at)
+        VALUES (new.id, 'updated', {PAYLOAD}, datetime('now', 'localtime'));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS post_events_delete AFTER DELETE ON posts BEGIN
+        INSERT INTO post_events(post_id, action, payload, created_at)
+        VALUES (old.id, 'deleted', json_object('id', old.id), datetime('now', 'localtime'));
+    END
+    """,
+]
+
+DROP_SCHEMA = [
+    'DROP TRIGGER IF EXISTS post_events_insert',
+    'DROP TRIGGER IF EXISTS post_events_update',
+    'DROP TRIGGER IF EXISTS post_events_delete',
+]
+
+
+def create_outbox_triggers(using = 'default'):
+    connection = connections[using]
+
+    if connection.vendor != 'sqlite':
+        return False
+
+    with transaction.atomic(using = using), connection.cursor() as cursor:
+        for statement in SCHEMA:
+            cursor.execute(statement)
+
+    return True
+
+
+def suspend_outbox_triggers(using = 'default'):
+    if connections[using].vendor != 'sqlite':
+        return
+
+    with connections[using].cursor() as cursor:
+        for statement in DROP_SCHEMA:
+            cursor.execute(statement)
+
+
+def events_after(last_id, limit, using = None):
+    events = PostEvent.objects.using(using).filter(id__gt = last_id).order_by('id')
+
+    return list(events[:limit])
+
+
+def last_event_id(using = None):
+    return PostEvent.objects.using(using).order_by('-id').values_list('id', flat = True).first() or 0
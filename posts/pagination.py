@@ -0,0 +1,43 @@
+import base64
+import datetime
+import json
+
+from django.conf import settings
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class InvalidLimit(ValueError):
+    pass
+
+
+def parse_limit(value, default = 5):
+    limit = default if value is None else int(value)
+
+    if not 1 <= limit <= settings.POST_LIST_MAX_LIMIT:
+        raise InvalidLimit(limit)
+
+    return limit
+
+
+def encode_cursor(*values):
+    values = [value.isoformat() if isinstance(value, datetime.datetime) else value for value in values]
+    raw    = json.dumps(values, separators = (',', ':'))
+
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, converters = (datetime.datetime.fromisoformat, int)):
+    try:
+        raw    = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+
+        if not isinstance(values, list) or len(values) != len(converters):
+            raise InvalidCursor(cursor)
+
+        return tuple(convert(value) for convert, value in zip(converters, values))
+
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
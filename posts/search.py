@@ -0,0 +1,163 @@
+from django.db        import connections
+from django.db.models import Q
+
+from .models import Post
+
+
+MIN_MATCH_LENGTH = 3
+
+_available = set()
+
+# posts_fts mirrors posts.title/content as an external content FTS5 table.
+# The trigram tokenizer indexes every 3-character window, so substring search
+# works for Korean text that has no whitespace between stems and particles.
+SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+        title, content, content = 'posts', content_rowid = 'id', tokenize = 'trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_update AFTER UPDATE OF title, content ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+# The triggers come first so bulk loads can drop just them and rebuild after.
+DROP_SCHEMA = [
+    'DROP TRIGGER IF EXISTS posts_fts_insert',
+    'DROP TRIGGER IF EXISTS posts_fts_delete',
+    'DROP TRIGGER IF EXISTS posts_fts_update',
+    'DROP TABLE IF EXISTS posts_fts',
+]
+
+
+def _has_search_table(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts_fts'")
+
+        return cursor.fetchone() is not None
+
+
+def create_search_index(using = 'default'):
+    connection = connections[using]
+
+    if connection.vendor != 'sqlite' or _has_search_table(connection):
+        return False
+
+    with connection.cursor() as cursor:
+        for statement in SCHEMA:
+            cursor.execute(statement)
+
+        cursor.execute("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
+
+    return True
+
+
+def rebuild_search_index(using = 'default'):
+    connection = connections[using]
+
+    with connection.cursor() as cursor:
+        for statement in DROP_SCHEMA:
+            cursor.execute(statement)
+
+    _available.discard(using)
+
+    return create_search_index(using)
+
+
+def suspend_search_triggers(using = 'default'):
+    with connections[using].cursor() as cursor:
+        for statement in DROP_SCHEMA[:3]:
+            cursor.execute(statement)
+
+
+def resume_search_triggers(using = 'default'):
+    with connections[using].cursor() as cursor:
+        for statement in SCHEMA:
+            cursor.execute(statement)
+
+        cursor.execute("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
+
+
+def search_available(using):
+    if using not in _available:
+        connection = connections[using]
+
+        if connection.vendor == 'sqlite' and _has_search_table(connection):
+            _available.add(using)
+
+    return using in _available
+
+
+def _escape_like(term):
+    return '%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def _search_fts(terms, limit, after):
+    phrases    = [term for term in terms if len(term) >= MIN_MATCH_LENGTH]
+    short      = [term for term in terms if len(term) < MIN_MATCH_LENGTH]
+    conditions = []
+    params     = []
+
+    if phrases:
+        conditions.append('posts_fts MATCH %s')
+        params.append(' AND '.join('"' + phrase.replace('"', '""') + '"' for phrase in phrases))
+
+    for term in short:
+        conditions.append("(title LIKE %s ESCAPE '\\' OR content LIKE %s ESCAPE '\\')")
+        params += [_escape_like(term), _escape_like(term)]
+
+    score = 'bm25(posts_fts)' if phrases else '0.0'
+    sql   = (
+        f'SELECT posts.*, hits.score FROM ('
+        f'SELECT rowid AS id, {score} AS score FROM posts_fts WHERE {" AND ".join(conditions)}'
+        f') AS hits JOIN posts ON posts.id = hits.id'
+    )
+
+    if after:
+        sql    += ' WHERE hits.score > %s OR (hits.score = %s AND hits.id > %s)'
+        params += [after[0], after[0], after[1]]
+
+    sql    += ' ORDER BY hits.score, hits.id LIMIT %s'
+    params += [limit]
+
+    return list(Post.objects.raw(sql, params))
+
+
+def _search_like(terms, limit, after):
+    posts = Post.objects.order_by('id')
+
+    for term in terms:
+        posts = posts.filter(Q(title__contains = term) | Q(content__contains = term))
+
+    if after:
+        posts = posts.filter(id__gt = after[1])
+
+    posts = list(posts[:limit])
+
+    for post in posts:
+        post.score = 0.0
+
+    return posts
+
+
+def search_posts(query, limit, after = None):
+    terms = query.split()
+
+    if search_available(Post.objects.db):
+        return _search_fts(terms, limit, after)
+
+    return _search_like(terms, limit, after)
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch          import receiver
+
+from core.microcache import purge_microcache
+from .cache          import invalidate_post
+from .feed           import bump_feed
+from .models         import Post
+
+
+def post_changed(post_id):
+    invalidate_post(post_id)
+    bump_feed()
+    purge_microcache()
+
+
+@receiver(post_save, sender = Post)
+@receiver(post_delete, sender = Post)
+def invalidate_cached_post(sender, instance, **kwargs):
+    post_changed(instance.id)
@@ -0,0 +1,204 @@
+import asyncio
+import json
+
+from collections  import deque
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf  import settings
+
+from .outbox import events_after, last_event_id
+
+
+# GET /posts/stream is a plain ASGI app mounted in wanted/asgi.py: Django 3.2
+# cannot stream a response from an async view. One poller per process reads
+# the outbox every POST_STREAM_POLL_INTERVAL seconds into a ring buffer that
+# all open connections follow; a client resuming from a Last-Event-ID older
+# than the buffer catches up from the database first.
+def frame(event):
+    data = json.dumps(event.payload, ensure_ascii = False)
+
+    return event.id, f'id: {event.id}\nevent: {event.action}\ndata: {data}\n\n'.encode('utf-8')
+
+
+def fetch_frames(last_id):
+    return [frame(event) for event in events_after(last_id, settings.POST_STREAM_BATCH_SIZE)]
+
+
+class Hub:
+    def __init__(self):
+        self.loop = None
+
+    def reset(self, loop):
+        self.loop      = loop
+        self.frames    = deque()
+        self.floor     = None
+        self.last_id   = None
+        self.listeners = 0
+        self.poller    = None
+        self.ready     = None
+        self.changed   = asyncio.Condition()
+
+    async def subscribe(self):
+        loop = asyncio.get_running_loop()
+
+        if self.loop is not loop:
+            self.reset(loop)
+
+        self.listeners += 1
+
+        if self.poller is None:
+            self.ready  = asyncio.Event()
+            self.poller = loop.create_task(self.poll())
+
+        await self.ready.wait()
+
+    def unsubscribe(self):
+        self.listeners -= 1
+
+    async def poll(self):
+        try:
+            # Nobody was following the outbox before, so the buffer is out of
+            # date; restart from the current tail.
+            self.last_id = self.floor = await sync_to_async(last_event_id)()
+            self.frames.clear()
+            self.ready.set()
+
+            while self.listeners:
+                frames = await sync_to_async(fetch_frames)(self.last_id)
+
+                if frames:
+                    await self.publish(frames)
+
+                if len(frames) < settings.POST_STREAM_BATCH_SIZE:
+                    await asyncio.sleep(settings.POST_STREAM_POLL_INTERVAL)
+        finally:
+            self.ready.set()
+            self.poller = None
+
+    async def publish(self, frames):
+        async with self.changed:
+            self.frames.extend(frames)
+            self.last_id = frames[-1][0]
+
+            while len(self.frames) > settings.POST_STREAM_BUFFER:
+                self.floor = self.frames.popleft()[0]
+
+            self.changed.notify_all()
+
+    async def wake(self):
+        async with self.changed:
+            self.changed.notify_all()
+
+    def since(self, last_id):
+        if last_id < self.floor:
+            return None
+
+        return [item for item in self.frames if item[0] > last_id]
+
+    async def wait(self, last_id, timeout):
+        async with self.changed:
+            if self.last_id > last_id:
+                return True
+
+            try:
+                await asyncio.wait_for(self.changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+
+            return True
+
+
+hub = Hub()
+
+
+def parse_last_event_id(scope):
+    headers = dict(scope['headers'])
+    value   = headers.get(b'last-event-id', b'').decode('latin-1')
+
+    if not value:
+        value = parse_qs(scope.get('query_string', b'').decode('latin-1')).get('last_event_id', [''])[0]
+
+    if not value:
+        return None
+
+    last_id = int(value)
+
+    if last_id < 0:
+        raise ValueError(value)
+
+    return last_id
+
+
+def cors_headers(scope):
+    # These apps bypass the middleware stack, CorsMiddleware included.
+    origin = dict(scope['headers']).get(b'origin')
+
+    if settings.CORS_ORIGIN_ALLOW_ALL and origin:
+        return [(b'access-control-allow-origin', origin), (b'access-control-allow-credentials', b'true')]
+
+    return []
+
+
+async def send_json(send, body, status):
+    await send({
+        'type'    : 'http.response.start',
+        'status'  : status,
+        'headers' : [(b'content-type', b'application/json')],
+    })
+    await send({'type' : 'http.response.body', 'body' : json.dumps(body).encode('utf-8')})
+
+
+async def stream_posts(scope, receive, send):
+    if scope['method'] != 'GET':
+        return await send_json(send, {'MESSAGE' : 'METHOD_NOT_ALLOWED'}, 405)
+
+    try:
+        last_id = parse_last_event_id(scope)
+    except ValueError:
+        return await send_json(send, {'MESSAGE' : 'INVALID_LAST_EVENT_ID'}, 400)
+
+    headers = [
+        (b'content-type', b'text/event-stream; charset=utf-8'),
+        (b'cache-control', b'no-cache'),
+        (b'x-accel-buffering', b'no'),
+    ] + cors_headers(scope)
+
+    await hub.subscribe()
+
+    async def watch_disconnect():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+        await hub.wake()
+
+    disconnected = asyncio.ensure_future(watch_disconnect())
+
+    try:
+        if last_id is None:
+            last_id = hub.last_id
+
+        await send({'type' : 'http.response.start', 'status' : 200, 'headers' : headers})
+        await send({
+            'type'      : 'http.response.body',
+            'body'      : f'retry: {settings.POST_STREAM_RETRY_MS}\n\n'.encode('utf-8'),
+            'more_body' : True,
+        })
+
+        while not disconnected.done():
+            frames = hub.since(last_id)
+
+            if frames is None:
+                frames = await sync_to_async(fetch_frames)(last_id)
+
+            if frames:
+                await send({'type' : 'http.response.body', 'body' : b''.join(body for _, body in frames), 'more_body' : True})
+                last_id = frames[-1][0]
+                continue
+
+            if not await hub.wait(last_id, settings.POST_STREAM_HEARTBEAT) and not disconnected.done():
+                await send({'type' : 'http.response.body', 'body' : b': keepalive\n\n', 'more_body' : True})
+
+    finally:
+        disconnected.cancel()
+        hub.unsubscribe()
@@ -1,16 +1,35 @@
+import asyncio
 import datetime
 import json
+import os
+import threading
+import time
 import jwt
 
-from django.test import TestCase, Client
+from asgiref.sync            import async_to_sync, sync_to_async
+from django.core.cache      import cache
+from django.core.management import call_command
+from django.db               import connection, transaction
+from django.test             import TestCase, Client, override_settings
+from django.test.utils       import CaptureQueriesContext
+from django.utils            import timezone
 
+from unittest.mock   import patch
 from wanted.settings import SECRET_KEY
 from users.models    import User
-from .models         import Post
+from .               import cache as posts_cache
+from .cache          import clear_local, get_post, invalidate_post
+from .export         import export_posts
+from .feed           import FEED_KEY, get_feed, patch_feed
+from .models         import Post, PostCount, PostEvent
+from .stream         import stream_posts
+from .text           import EXCERPT_LENGTH, make_excerpt
 
 
 class PostViewTest(TestCase):
     def setUp(self):
+        cache.clear()
+        clear_local()
         User.objects.bulk_create(
             [
                 User(
@@ -205,6 +224,20 @@ class PostViewTest(TestCase):
         self.assertEqual(response.status_code, 201)
         self.assertEqual(response.json(), {"MESSAGE": "SUCCESS"})
 
+    def test_post_view_value_error(self):
+        token  = jwt.encode({'id' : 1}, SECRET_KEY, algorithm = "HS256")
+        header = {"HTTP_AUTHORIZATION" : token}
+        client = Client()
+
+        for post in ({"title" : "테스트", "content" : 123}, {"title" : None, "content" : "내용"}):
+            for method, path in ((client.post, "/posts"), (client.put, "/posts/1")):
+                response = method(path, json.dumps(post), content_type = "application/json", **header)
+
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {"MESSAGE" : "VALUE_ERROR"})
+
+        self.assertEqual(Post.objects.get(id = 1).title, "테스트 1번")
+
     def test_post_view_put_dose_not_exist_post(self):
         token = jwt.encode({'id' : 1}, SECRET_KEY, algorithm = "HS256")
         header = {"HTTP_AUTHORIZATION" : token}
@@ -265,6 +298,7 @@ class PostViewTest(TestCase):
             response.json(),
             {
                 "count": 5,
+                "total": 7,
                 "RESULT": [
                     {
                         "author"     : "wooju0",
@@ -299,3 +333,912 @@ class PostViewTest(TestCase):
                 ]
             }
         )
+
+    def test_postlist_view_get_cursor_first_page(self):
+        client   = Client()
+        response = client.get("/posts/list?cursor=&limit=3")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 3)
+        self.assertEqual(
+            [post["title"] for post in response.json()["RESULT"]],
+            ["테스트 1번", "테스트 2번", "테스트 3번"]
+        )
+        self.assertIsNotNone(response.json()["next_cursor"])
+
+    def test_postlist_view_get_cursor_next_page(self):
+        client      = Client()
+        next_cursor = client.get("/posts/list?cursor=&limit=3").json()["next_cursor"]
+        response    = client.get(f"/posts/list?cursor={next_cursor}&limit=3")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [post["title"] for post in response.json()["RESULT"]],
+            ["테스트 4번", "테스트 5번", "테스트 6번"]
+        )
+
+        next_cursor = response.json()["next_cursor"]
+        response    = client.get(f"/posts/list?cursor={next_cursor}&limit=3")
+
+        self.assertEqual(
+            [post["title"] for post in response.json()["RESULT"]],
+            ["테스트 7번"]
+        )
+        self.assertIsNone(response.json()["next_cursor"])
+
+    def test_postlist_view_get_cursor_stable_after_delete(self):
+        client      = Client()
+        next_cursor = client.get("/posts/list?cursor=&limit=3").json()["next_cursor"]
+
+        Post.objects.filter(id = 1).delete()
+
+        response = client.get(f"/posts/list?cursor={next_cursor}&limit=3")
+
+        self.assertEqual(
+            [post["title"] for post in response.json()["RESULT"]],
+            ["테스트 4번", "테스트 5번", "테스트 6번"]
+        )
+
+    def test_postlist_view_get_invalid_cursor(self):
+        client   = Client()
+        response = client.get("/posts/list?cursor=invalid&limit=3")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"MESSAGE" : "INVALID_CURSOR"})
+
+    def test_postlist_view_query_budget_independent_of_page_size(self):
+        client = Client()
+
+        for limit in (1, 3, 6):
+            with self.assertNumQueries(1):
+                client.get(f"/posts/list?offset=1&limit={limit}")
+
+    def test_postlist_view_cursor_query_budget(self):
+        client      = Client()
+        next_cursor = client.get("/posts/list?cursor=&limit=2").json()["next_cursor"]
+
+        with self.assertNumQueries(1):
+            client.get(f"/posts/list?cursor={next_cursor}&limit=5")
+
+    def test_post_view_get_query_budget(self):
+        client = Client()
+
+        with self.assertNumQueries(1):
+            client.get("/posts/1")
+
+    def test_post_view_create_query_budget(self):
+        token  = jwt.encode({'id' : 3}, SECRET_KEY, algorithm = "HS256")
+        header = {"HTTP_AUTHORIZATION" : token}
+        post   = {"title" : "테스트 8번", "content" : "테스트 8번 내용"}
+
+        client = Client()
+
+        with self.assertNumQueries(2):
+            client.post("/posts", json.dumps(post), content_type = "application/json", **header)
+
+    def test_post_view_put_query_budget(self):
+        token  = jwt.encode({'id' : 1}, SECRET_KEY, algorithm = "HS256")
+        header = {"HTTP_AUTHORIZATION" : token}
+        post   = {"title" : "수정 1번", "content" : "수정 1번 내용"}
+
+        client = Client()
+
+        with self.assertNumQueries(2):
+            client.put("/posts/1", json.dumps(post), content_type = "application/json", **header)
+
+    def test_post_view_delete_query_budget(self):
+        token  = jwt.encode({'id' : 1}, SECRET_KEY, algorithm = "HS256")
+        header = {"HTTP_AUTHORIZATION" : token}
+
+        client = Client()
+
+        with self.assertNumQueries(2):
+            client.delete("/posts/1", **header)
+
+    def test_post_view_get_cached(self):
+        client = Client()
+        client.get("/posts/1")
+
+        with self.assertNumQueries(0):
+            response = client.get("/posts/1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["RESULT"]["title"], "테스트 1번")
+
+    def test_post_view_get_cache_invalidated_by_put(self):
+        token  = jwt.encode({'id' : 1}, SECRET_KEY, algorithm = "HS256")
+        header = {"HTTP_AUTHORIZATION" : token}
+        post   = {"title" : "수정 1번", "content" : "수정 1번 내용"}
+
+        client = Client()
+        client.get("/posts/1")
+        client.put("/posts/1", json.dumps(post), content_type = "application/json", **header)
+
+        self.assertEqual(client.get("/posts/1").json()["RESULT"]["title"], "수정 1번")
+
+    def test_post_view_get_cache_invalidated_by_delete(self):
+        token  = jwt.encode({'id' : 1}, SECRET_KEY, algorithm = "HS256")
+        header = {"HTTP_AUTHORIZATION" : token}
+
+        client = Client()
+        client.get("/posts/1")
+        client.delete("/posts/1", **header)
+
+        self.assertEqual(client.get("/posts/1").status_code, 404)
+
+    def test_post_view_get_cache_invalidated_by_save(self):
+        client = Client()
+        client.get("/posts/1")
+
+        post       = Post.objects.get(id = 1)
+        post.title = "수정 1번"
+        post.save()
+
+        self.assertEqual(client.get("/posts/1").json()["RESULT"]["title"], "수정 1번")
+
+    def test_post_cache_collapses_concurrent_misses(self):
+        calls = []
+
+        def load_post(post_id, version):
+            calls.append(post_id)
+            time.sleep(0.05)
+            return {"title" : "테스트", "version" : version}
+
+        with patch("posts.cache._load_post", side_effect = load_post):
+            threads = [threading.Thread(target = get_post, args = (99,)) for _ in range(8)]
+
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(calls, [99])
+
+    def test_post_cache_fill_does_not_undo_invalidation(self):
+        load_post = posts_cache._load_post
+
+        def racing_load(post_id, version):
+            entry = load_post(post_id, version)
+
+            # A write commits and invalidates while the fill is in flight.
+            Post.objects.filter(id = post_id).update(title = "수정")
+            invalidate_post(post_id)
+
+            return entry
+
+        with patch("posts.cache._load_post", side_effect = racing_load):
+            get_post(1)
+
+        self.assertEqual(get_post(1)["result"]["title"], "수정")
+
+    def test_post_view_get_validators(self):
+        client   = Client()
+        response = client.get("/posts/1")
+
+        self.assertTrue(response.has_header("ETag"))
+        self.assertTrue(response.has_header("Last-Modified"))
+
+    def test_post_view_get_if_none_match_not_modified(self):
+        client = Client()
+        etag   = client.get("/posts/1")["ETag"]
+
+        with self.assertNumQueries(0):
+            response = client.get("/posts/1", HTTP_IF_NONE_MATCH = etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_post_view_get_if_none_match_narrow_query(self):
+        client = Client()
+        etag   = client.get("/posts/1")["ETag"]
+
+        cache.clear()
+        clear_local()
+
+        with self.assertNumQueries(1) as context:
+            response = client.get("/posts/1", HTTP_IF_NONE_MATCH = etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertNotIn('"content"', context.captured_queries[0]["sql"])
+
+    def test_post_view_get_if_modified_since_not_modified(self):
+        client        = Client()
+        last_modified = client.get("/posts/1")["Last-Modified"]
+        response      = client.get("/posts/1", HTTP_IF_MODIFIED_SINCE = last_modified)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_post_view_get_if_none_match_after_put(self):
+        token  = jwt.encode({'id' : 1}, SECRET_KEY, algorithm = "HS256")
+        header = {"HTTP_AUTHORIZATION" : token}
+        post   = {"title" : "수정 1번", "content" : "수정 1번 내용"}
+
+        client = Client()
+        etag   = client.get("/posts/1")["ETag"]
+
+        client.put("/posts/1", json.dumps(post), content_type = "application/json", **header)
+
+        response = client.get("/posts/1", HTTP_IF_NONE_MATCH = etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["RESULT"]["title"], "수정 1번")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_postlist_view_get_if_none_match_not_modified(self):
+        client = Client()
+        etag   = client.get("/posts/list?offset=0&limit=5")["ETag"]
+
+        with self.assertNumQueries(0):
+            response = client.get("/posts/list?offset=0&limit=5", HTTP_IF_NONE_MATCH = etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_postlist_view_get_if_none_match_after_delete(self):
+        client = Client()
+        etag   = client.get("/posts/list?cursor=&limit=5")["ETag"]
+
+        Post.objects.filter(id = 2).delete()
+
+        response = client.get("/posts/list?cursor=&limit=5", HTTP_IF_NONE_MATCH = etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 5)
+
+    def test_post_view_delete_no_permission_keeps_post(self):
+        token  = jwt.encode({'id' : 1}, SECRET_KEY, algorithm = "HS256")
+        header = {"HTTP_AUTHORIZATION" : token}
+
+        client = Client()
+
+        with self.assertNumQueries(3):
+            response = client.delete("/posts/5", **header)
+
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(Post.objects.filter(id = 5).exists())
+
+    def test_post_view_put_no_permission_keeps_post(self):
+        token  = jwt.encode({'id' : 1}, SECRET_KEY, algorithm = "HS256")
+        header = {"HTTP_AUTHORIZATION" : token}
+        post   = {"title" : "수정 1번", "content" : "수정 1번 내용"}
+
+        client = Client()
+        client.put("/posts/5", json.dumps(post), content_type = "application/json", **header)
+
+        self.assertEqual(Post.objects.get(id = 5).title, "테스트 5번")
+
+    def test_post_bulk_view_create_success(self):
+        token  = jwt.encode({'id' : 3}, SECRET_KEY, algorithm = "HS256")
+        header = {"HTTP_AUTHORIZATION" : token}
+        posts  = [{"title" : f"벌크 {i}번", "content" : f"벌크 {i}번 내용"} for i in range(5)]
+
+        client   = Client()
+        response = client.post(
+            "/posts/bulk", json.dumps(posts), content_type = "application/json", **header
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {"MESSAGE" : "SUCCESS", "count" : 5})
+        self.assertEqual(Post.objects.filter(user_id = 3, title__startswith = "벌크").count(), 5)
+        self.assertEqual(Post.objects.filter(title = "벌크 0번").get().author, "wooju2")
+
+    def test_post_bulk_view_create_ndjson(self):
+        token  = jwt.encode({'id' : 3}, SECRET_KEY, algorithm = "HS256")
+        header = {"HTTP_AUTHORIZATION" : token}
+        body   = "\n".join(
+            json.dumps({"title" : f"벌크 {i}번", "content" : f"벌크 {i}번 내용"}) for i in range(3)
+        )
+
+        client   = Client()
+        response = client.post("/posts/bulk", body, content_type = "application/x-ndjson", **header)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {"MESSAGE" : "SUCCESS", "count" : 3})
+
+    def test_post_bulk_view_item_errors(self):
+        token  = jwt.encode({'id' : 3}, SECRET_KEY, algorithm = "HS256")
+        header = {"HTTP_AUTHORIZATION" : token}
+        posts  = [
+            {"title" : "벌크 0번", "content" : "벌크 0번 내용"},
+            {"title" : "벌크 1번"},
+            {"title" : 1, "content" : "벌크 2번 내용"},
+            {"title" : "벌" * 201, "content" : "벌크 3번 내용"},
+        ]
+
+        client   = Client()
+        response = client.post(
+            "/posts/bulk", json.dumps(posts), content_type = "application/json", **header
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {
+            "MESSAGE" : "INVALID_ITEMS",
+            "ERRORS"  : [
+                {"index" : 1, "MESSAGE" : "KEY_ERROR"},
+                {"index" : 2, "MESSAGE" : "VALUE_ERROR"},
+                {"index" : 3, "MESSAGE" : "TITLE_TOO_LONG"},
+            ]
+        })
+        self.assertFalse(Post.objects.filter(title = "벌크 0번").exists())
+
+    @override_settings(POST_BULK_MAX_ITEMS = 2)
+    def test_post_bulk_view_too_many_items(self):
+        token  = jwt.encode({'id' : 3}, SECRET_KEY, algorithm = "HS256")
+        header = {"HTTP_AUTHORIZATION" : token}
+        posts  = [{"title" : f"벌크 {i}번", "content" : f"벌크 {i}번 내용"} for i in range(3)]
+
+        client   = Client()
+        response = client.post(
+            "/posts/bulk", json.dumps(posts), content_type = "application/json", **header
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"MESSAGE" : "TOO_MANY_ITEMS"})
+
+    @override_settings(POST_BULK_BATCH_SIZE = 2)
+    def test_post_bulk_view_batches_inserts(self):
+        token  = jwt.encode({'id' : 3}, SECRET_KEY, algorithm = "HS256")
+        header = {"HTTP_AUTHORIZATION" : token}
+        posts  = [{"title" : f"벌크 {i}번", "content" : f"벌크 {i}번 내용"} for i in range(5)]
+
+        client = Client()
+
+        with self.assertNumQueries(6) as context:
+            client.post("/posts/bulk", json.dumps(posts), content_type = "application/json", **header)
+
+        inserts = [query for query in context.captured_queries if query["sql"].startswith("INSERT")]
+
+        self.assertEqual(len(inserts), 3)
+
+    def test_post_view_get_many_success(self):
+        client = Client()
+
+        with self.assertNumQueries(1):
+            response = client.get("/posts?ids=3,15,1,3")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(post["id"], post["title"]) for post in response.json()["RESULT"]],
+            [(3, "테스트 3번"), (1, "테스트 1번")]
+        )
+        self.assertEqual(response.json()["MISSING"], [15])
+
+    def test_post_view_get_many_uses_cache(self):
+        client = Client()
+        client.get("/posts/1")
+        client.get("/posts/2")
+
+        with self.assertNumQueries(0):
+            client.get("/posts?ids=1,2")
+
+        with self.assertNumQueries(1) as context:
+            response = client.get("/posts?ids=1,2,4")
+
+        self.assertIn('"posts"."id" IN (4)', context.captured_queries[0]["sql"])
+        self.assertEqual([post["id"] for post in response.json()["RESULT"]], [1, 2, 4])
+
+    @override_settings(POST_BATCH_MAX_IDS = 2)
+    def test_post_view_get_many_too_many_ids(self):
+        client   = Client()
+        response = client.get("/posts?ids=1,2,3")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"MESSAGE" : "TOO_MANY_IDS"})
+
+    def test_post_view_get_many_not_int(self):
+        client   = Client()
+        response = client.get("/posts?ids=1,a")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"MESSAGE" : "NOT_INT"})
+
+    def test_post_view_get_many_key_error(self):
+        client   = Client()
+        response = client.get("/posts")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"MESSAGE" : "KEY_ERROR"})
+
+    def test_post_export_view_streams_ndjson(self):
+        client   = Client()
+        response = client.get("/posts/export")
+        lines    = b"".join(response.streaming_content).decode("utf-8").splitlines()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual([json.loads(line)["id"] for line in lines], [1, 2, 3, 4, 5, 6, 7])
+        self.assertEqual(
+            set(json.loads(lines[0])),
+            {"id", "user_id", "author", "title", "content", "created_at", "updated_at"}
+        )
+
+    @override_settings(POST_EXPORT_CHUNK_SIZE = 3)
+    def test_post_export_view_keyset_chunks(self):
+        client   = Client()
+        response = client.get("/posts/export")
+
+        with self.assertNumQueries(3):
+            lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+
+        self.assertEqual([json.loads(line)["id"] for line in lines], [1, 2, 3, 4, 5, 6, 7])
+
+    def test_post_export_view_since(self):
+        since = Post.objects.get(id = 7).updated_at
+
+        Post.objects.filter(id = 2).update(updated_at = since + datetime.timedelta(seconds = 1))
+
+        client   = Client()
+        response = client.get("/posts/export", {"since" : since.isoformat()})
+        lines    = b"".join(response.streaming_content).decode("utf-8").splitlines()
+
+        self.assertEqual([json.loads(line)["id"] for line in lines], [7, 2])
+
+    def test_post_export_view_since_with_offset(self):
+        since = Post.objects.get(id = 7).updated_at
+
+        Post.objects.filter(id = 2).update(updated_at = since + datetime.timedelta(seconds = 1))
+
+        utc      = timezone.make_aware(since).astimezone(datetime.timezone.utc)
+        client   = Client()
+        response = client.get("/posts/export", {"since" : utc.isoformat()})
+        lines    = b"".join(response.streaming_content).decode("utf-8").splitlines()
+
+        self.assertEqual([json.loads(line)["id"] for line in lines], [7, 2])
+
+    def test_post_export_view_invalid_since(self):
+        client   = Client()
+        response = client.get("/posts/export?since=yesterday")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"MESSAGE" : "INVALID_SINCE"})
+
+    def export_asgi(self, query_string = b""):
+        messages = []
+
+        async def receive():
+            return {'type' : 'http.request', 'body' : b''}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {'type' : 'http', 'method' : 'GET', 'path' : '/posts/export', 'query_string' : query_string, 'headers' : []}
+
+        async_to_sync(export_posts)(scope, receive, send)
+
+        return messages[0], b"".join(message.get('body', b'') for message in messages[1:]).decode("utf-8")
+
+    @override_settings(POST_EXPORT_CHUNK_SIZE = 3)
+    def test_post_export_asgi_app(self):
+        with self.assertNumQueries(3):
+            start, body = self.export_asgi()
+
+        self.assertEqual(start["status"], 200)
+        self.assertIn((b"content-type", b"application/x-ndjson"), start["headers"])
+        self.assertEqual([json.loads(line)["id"] for line in body.splitlines()], [1, 2, 3, 4, 5, 6, 7])
+
+    def test_post_export_asgi_app_invalid_since(self):
+        start, body = self.export_asgi(b"since=yesterday")
+
+        self.assertEqual(start["status"], 400)
+        self.assertEqual(json.loads(body), {"MESSAGE" : "INVALID_SINCE"})
+
+    def test_post_search_view_success(self):
+        client   = Client()
+        response = client.get("/posts/search", {"q" : "테스트 3번"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([post["id"] for post in response.json()["RESULT"]], [3])
+
+    def test_post_search_view_short_query(self):
+        client   = Client()
+        response = client.get("/posts/search", {"q" : "내용", "limit" : 10})
+
+        self.assertEqual(response.json()["count"], 7)
+
+    def test_post_search_view_keyset_pages(self):
+        client   = Client()
+        post_ids = []
+        cursor   = ""
+
+        while cursor is not None:
+            response = client.get("/posts/search", {"q" : "테스트", "limit" : 3, "cursor" : cursor})
+            post_ids += [post["id"] for post in response.json()["RESULT"]]
+            cursor   = response.json()["next_cursor"]
+
+        self.assertEqual(sorted(post_ids), [1, 2, 3, 4, 5, 6, 7])
+
+    def test_post_search_view_follows_writes(self):
+        token  = jwt.encode({'id' : 1}, SECRET_KEY, algorithm = "HS256")
+        header = {"HTTP_AUTHORIZATION" : token}
+        post   = {"title" : "검색어 변경", "content" : "수정 1번 내용"}
+
+        client = Client()
+        client.put("/posts/1", json.dumps(post), content_type = "application/json", **header)
+        client.delete("/posts/2", **header)
+
+        self.assertEqual([post["id"] for post in client.get("/posts/search", {"q" : "검색어"}).json()["RESULT"]], [1])
+        self.assertEqual(client.get("/posts/search", {"q" : "테스트 2번"}).json()["RESULT"], [])
+
+    def test_post_search_view_escapes_query(self):
+        client   = Client()
+        response = client.get("/posts/search", {"q" : '"테스트" %_ OR'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["RESULT"], [])
+
+    def test_post_search_view_empty_value(self):
+        client   = Client()
+        response = client.get("/posts/search", {"q" : " "})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"MESSAGE" : "EMPTY_VALUE"})
+
+    def test_rebuild_search_index_command(self):
+        call_command("rebuild_search_index", stdout = open(os.devnull, "w"))
+
+        client   = Client()
+        response = client.get("/posts/search", {"q" : "테스트 7번"})
+
+        self.assertEqual([post["id"] for post in response.json()["RESULT"]], [7])
+
+    def test_user_post_list_view_newest_first(self):
+        client      = Client()
+        response    = client.get("/users/2/posts?limit=2")
+        next_cursor = response.json()["next_cursor"]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([post["id"] for post in response.json()["RESULT"]], [5, 4])
+
+        response = client.get(f"/users/2/posts?limit=2&cursor={next_cursor}")
+
+        self.assertEqual([post["id"] for post in response.json()["RESULT"]], [3])
+        self.assertIsNone(response.json()["next_cursor"])
+
+    def test_user_post_list_view_does_not_exist_user(self):
+        client   = Client()
+        response = client.get("/users/99/posts")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"MESSAGE" : "DOSE_NOT_EXIST_USER"})
+
+    def test_user_post_list_view_invalid_cursor(self):
+        client   = Client()
+        response = client.get("/users/2/posts?cursor=invalid")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"MESSAGE" : "INVALID_CURSOR"})
+
+    def test_user_post_list_view_query_budget(self):
+        client      = Client()
+        next_cursor = client.get("/users/2/posts?limit=1").json()["next_cursor"]
+
+        with self.assertNumQueries(1):
+            client.get(f"/users/2/posts?limit=1&cursor={next_cursor}")
+
+    def test_user_post_list_view_uses_index(self):
+        plan = Post.objects.filter(user_id = 2).order_by("-created_at", "-id")[:6].explain()
+
+        self.assertIn("posts_user_created_at_id_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_post_counts_follow_writes(self):
+        token  = jwt.encode({'id' : 3}, SECRET_KEY, algorithm = "HS256")
+        header = {"HTTP_AUTHORIZATION" : token}
+        posts  = [{"title" : f"벌크 {i}번", "content" : f"벌크 {i}번 내용"} for i in range(3)]
+
+        client = Client()
+        client.post("/posts", json.dumps({"title" : "테스트 8번", "content" : "테스트 8번 내용"}), content_type = "application/json", **header)
+        client.post("/posts/bulk", json.dumps(posts), content_type = "application/json", **header)
+        client.delete("/posts/6", **header)
+
+        self.assertEqual(client.get("/posts/list?offset=0&limit=1").json()["total"], 10)
+        self.assertEqual(client.get("/users/3/posts?limit=1").json()["total"], 5)
+        self.assertEqual(client.get("/users/1/posts?cursor=&limit=1").json()["total"], 2)
+
+    def test_post_counts_empty_page(self):
+        client = Client()
+
+        self.assertEqual(client.get("/posts/list?offset=100&limit=5").json()["total"], 7)
+
+    def test_postlist_view_etag_covers_total(self):
+        client = Client()
+        etag   = client.get("/posts/list?offset=0&limit=2")["ETag"]
+
+        Post.objects.create(author = "wooju0", user_id = 1, title = "테스트 8번", content = "테스트 8번 내용")
+
+        response = client.get("/posts/list?offset=0&limit=2", HTTP_IF_NONE_MATCH = etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["total"], 8)
+
+    def test_recount_posts_command(self):
+        PostCount.objects.filter(scope = "all").update(count = 100)
+        PostCount.objects.filter(scope = "user:2").delete()
+
+        call_command("recount_posts", stdout = open(os.devnull, "w"))
+
+        self.assertEqual(PostCount.objects.get(scope = "all").count, 7)
+        self.assertEqual(PostCount.objects.get(scope = "user:2").count, 3)
+
+    def test_post_excerpt_maintained_on_write(self):
+        token  = jwt.encode({'id' : 1}, SECRET_KEY, algorithm = "HS256")
+        header = {"HTTP_AUTHORIZATION" : token}
+        long   = "긴 내용 " * 100
+
+        client = Client()
+        client.put("/posts/1", json.dumps({"title" : "수정", "content" : long}), content_type = "application/json", **header)
+        client.post("/posts/bulk", json.dumps([{"title" : "벌크", "content" : "벌크\n\n내용"}]), content_type = "application/json", **header)
+
+        self.assertEqual(Post.objects.get(id = 2).excerpt, "테스트 2번 내용")
+        self.assertEqual(Post.objects.get(id = 1).excerpt, make_excerpt(long))
+        self.assertTrue(Post.objects.get(id = 1).excerpt.endswith("…"))
+        self.assertLessEqual(len(Post.objects.get(id = 1).excerpt), EXCERPT_LENGTH + 1)
+        self.assertEqual(Post.objects.get(title = "벌크").excerpt, "벌크 내용")
+
+    def test_postlist_view_fields_projection(self):
+        client = Client()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get("/posts/list?cursor=&limit=2&fields=id,title,excerpt")
+
+        self.assertEqual(response.json()["RESULT"], [
+            {"id" : 1, "title" : "테스트 1번", "excerpt" : "테스트 1번 내용"},
+            {"id" : 2, "title" : "테스트 2번", "excerpt" : "테스트 2번 내용"},
+        ])
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"posts"."content"', queries[0]["sql"])
+
+    def test_postlist_view_fields_projection_cursor(self):
+        client   = Client()
+        response = client.get("/users/2/posts?cursor=&limit=2&fields=title")
+
+        self.assertEqual(response.json()["RESULT"], [{"title" : "테스트 5번"}, {"title" : "테스트 4번"}])
+
+    def test_postlist_view_invalid_fields(self):
+        client   = Client()
+        response = client.get("/posts/list?offset=0&fields=title,password")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"MESSAGE" : "INVALID_FIELDS"})
+
+    @override_settings(POST_LIST_MAX_LIMIT = 10)
+    def test_postlist_view_limit_bounds(self):
+        client = Client()
+
+        for url in ("/posts/list?offset=0&limit=11", "/posts/list?cursor=&limit=0", "/users/1/posts?limit=11", "/posts/search?q=테스트&limit=11"):
+            response = client.get(url)
+
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {"MESSAGE" : "INVALID_LIMIT"})
+
+        self.assertEqual(client.get("/posts/list?offset=-1").json(), {"MESSAGE" : "NOT_INT"})
+
+    def test_backfill_excerpts_command(self):
+        Post.objects.update(excerpt = "")
+
+        call_command("backfill_excerpts", batch_size = 3, stdout = open(os.devnull, "w"))
+
+        self.assertEqual(Post.objects.filter(excerpt = "").count(), 0)
+        self.assertEqual(Post.objects.get(id = 7).excerpt, "테스트 7번 내용")
+
+    def test_postlist_view_first_page_from_feed(self):
+        client   = Client()
+        response = client.get("/posts/list?offset=0&limit=5")
+
+        with self.assertNumQueries(0):
+            cached = client.get("/posts/list?offset=0&limit=3&fields=id,excerpt")
+
+        self.assertEqual(cached.json()["total"], 7)
+        self.assertEqual(cached.json()["RESULT"], [
+            {"id" : post["id"], "excerpt" : post["content"]}
+            for post in client.get("/posts/list?cursor=&limit=3&fields=id,content").json()["RESULT"]
+        ])
+        self.assertEqual(response.json()["RESULT"][0]["title"], "테스트 1번")
+
+    def test_postlist_view_first_page_follows_writes(self):
+        token  = jwt.encode({'id' : 1}, SECRET_KEY, algorithm = "HS256")
+        header = {"HTTP_AUTHORIZATION" : token}
+        client = Client()
+        client.get("/posts/list?offset=0&limit=5")
+
+        client.put("/posts/1", json.dumps({"title" : "수정", "content" : "수정 내용"}), content_type = "application/json", **header)
+
+        with self.assertNumQueries(0):
+            response = client.get("/posts/list?offset=0&limit=5")
+
+        self.assertEqual(response.json()["RESULT"][0]["title"], "수정")
+
+        client.delete("/posts/2", **header)
+        client.post("/posts", json.dumps({"title" : "새 글", "content" : "새 글 내용"}), content_type = "application/json", **header)
+
+        response = client.get("/posts/list?offset=0&limit=5")
+
+        self.assertEqual([post["title"] for post in response.json()["RESULT"]][:2], ["수정", "테스트 3번"])
+        self.assertEqual(response.json()["total"], 7)
+
+    def test_post_feed_ignores_stale_snapshot(self):
+        client = Client()
+        client.get("/posts/list?offset=0&limit=5")
+
+        Post.objects.get(id = 1).delete()
+
+        with self.assertNumQueries(1):
+            response = client.get("/posts/list?offset=0&limit=5")
+
+        self.assertEqual(response.json()["RESULT"][0]["title"], "테스트 2번")
+
+    def stream(self, until, headers = (), on_start = None):
+        messages = []
+
+        async def run():
+            done = asyncio.Event()
+
+            async def receive():
+                await done.wait()
+
+                return {'type' : 'http.disconnect'}
+
+            async def send(message):
+                messages.append(message)
+
+                if message['type'] == 'http.response.start' and on_start:
+                    await sync_to_async(on_start)()
+
+                if until in b''.join(message.get('body', b'') for message in messages):
+                    done.set()
+
+            scope = {'type' : 'http', 'method' : 'GET', 'path' : '/posts/stream', 'query_string' : b'', 'headers' : list(headers)}
+
+            await asyncio.wait_for(stream_posts(scope, receive, send), 5)
+
+        with override_settings(POST_STREAM_POLL_INTERVAL = 0.01):
+            async_to_sync(run)()
+
+        return messages[0], b''.join(message.get('body', b'') for message in messages).decode()
+
+    def test_post_events_written_with_writes(self):
+        last_id = PostEvent.objects.order_by('-id').first().id
+        token   = jwt.encode({'id' : 1}, SECRET_KEY, algorithm = "HS256")
+        client  = Client()
+
+        client.put("/posts/1", json.dumps({"title" : "수정", "content" : "수정 내용"}), content_type = "application/json", HTTP_AUTHORIZATION = token)
+        client.delete("/posts/2", HTTP_AUTHORIZATION = token)
+
+        events = PostEvent.objects.filter(id__gt = last_id).order_by('id')
+
+        self.assertEqual(PostEvent.objects.filter(action = "created").count(), 7)
+        self.assertEqual([(event.post_id, event.action) for event in events], [(1, "updated"), (2, "deleted")])
+        self.assertEqual(events[0].payload["title"], "수정")
+        self.assertEqual(events[0].payload["author"], "wooju0")
+        self.assertEqual(events[1].payload, {"id" : 2})
+
+    def test_post_events_rolled_back_with_write(self):
+        count = PostEvent.objects.count()
+
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            Post.objects.filter(id = 1).update(title = "수정")
+            raise RuntimeError
+
+        self.assertEqual(PostEvent.objects.count(), count)
+
+    def test_post_stream_resumes_from_last_event_id(self):
+        last_id = PostEvent.objects.order_by('-id').first().id
+        Post.objects.filter(id = 1).update(title = "수정")
+        Post.objects.filter(id = 2).delete()
+
+        start, body = self.stream(b"event: deleted", headers = [(b"last-event-id", str(last_id).encode())])
+
+        self.assertEqual(start["status"], 200)
+        self.assertIn((b"content-type", b"text/event-stream; charset=utf-8"), start["headers"])
+        self.assertTrue(body.startswith("retry: "))
+        self.assertIn(f'id: {last_id + 1}\nevent: updated\ndata: {{"id": 1, ', body)
+        self.assertIn(f'id: {last_id + 2}\nevent: deleted\ndata: {{"id": 2}}', body)
+        self.assertNotIn("event: created", body)
+
+    def test_post_stream_follows_new_writes(self):
+        def create():
+            Post.objects.create(author = "wooju0", user_id = 1, title = "테스트 8번", content = "테스트 8번 내용")
+
+        start, body = self.stream(b"event: created", on_start = create)
+
+        self.assertEqual(body.count("event: created"), 1)
+        self.assertIn('"title": "테스트 8번"', body)
+
+    def test_post_stream_invalid_last_event_id(self):
+        start, body = self.stream(b"", headers = [(b"last-event-id", b"abc")])
+
+        self.assertEqual(start["status"], 400)
+        self.assertEqual(json.loads(body), {"MESSAGE" : "INVALID_LAST_EVENT_ID"})
+
+    def test_prune_post_events_command(self):
+        PostEvent.objects.update(created_at = datetime.datetime.now() - datetime.timedelta(days = 8))
+        Post.objects.filter(id = 1).update(title = "수정")
+
+        call_command("prune_post_events", stdout = open(os.devnull, "w"))
+
+        self.assertEqual(list(PostEvent.objects.values_list("action", flat = True)), ["updated"])
+
+    def patch(self, post_id, data, user_id = 1):
+        token = jwt.encode({'id' : user_id}, SECRET_KEY, algorithm = "HS256")
+
+        return Client().patch(f"/posts/{post_id}", json.dumps(data), content_type = "application/json", HTTP_AUTHORIZATION = token)
+
+    def test_post_view_patch_title_only(self):
+        Post.objects.filter(id = 1).update(updated_at = datetime.datetime(2021, 1, 1))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.patch(1, {"title" : "수정 1번"})
+
+        post = Post.objects.get(id = 1)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {"MESSAGE" : "SUCCESS"})
+        self.assertEqual((post.title, post.content, post.excerpt), ("수정 1번", "테스트 1번 내용", "테스트 1번 내용"))
+        self.assertGreater(post.updated_at, datetime.datetime(2021, 1, 1))
+        self.assertFalse(any('"content"' in query["sql"] for query in queries.captured_queries))
+
+    def test_post_view_patch_content_updates_excerpt_and_feed(self):
+        client = Client()
+        client.get("/posts/list?offset=0&limit=5")
+
+        response = self.patch(1, {"content" : "수정 " * 100})
+        result   = client.get("/posts/list?offset=0&limit=5").json()["RESULT"][0]
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Post.objects.get(id = 1).excerpt, make_excerpt("수정 " * 100))
+        self.assertEqual(result["content"], "수정 " * 100)
+        self.assertEqual(PostEvent.objects.order_by('-id').first().action, "updated")
+
+    def test_post_view_patch_unchanged_skips_write(self):
+        updated_at = Post.objects.get(id = 1).updated_at
+        events     = PostEvent.objects.count()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.patch(1, {"title" : "테스트 1번", "content" : "테스트 1번 내용"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"MESSAGE" : "NOT_CHANGED"})
+        self.assertEqual(Post.objects.get(id = 1).updated_at, updated_at)
+        self.assertEqual(PostEvent.objects.count(), events)
+        self.assertFalse(any(query["sql"].startswith("UPDATE") for query in queries.captured_queries))
+
+    def test_post_view_patch_skips_unchanged_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.patch(1, {"title" : "수정 1번", "content" : "테스트 1번 내용"})
+
+        update = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("UPDATE")]
+
+        self.assertEqual(len(update), 1)
+        self.assertNotIn('"content"', update[0])
+
+    def test_post_view_patch_errors(self):
+        self.assertEqual(self.patch(1, {"author" : "wooju9"}).json(), {"MESSAGE" : "KEY_ERROR"})
+        self.assertEqual(self.patch(1, {"title" : 1}).json(), {"MESSAGE" : "VALUE_ERROR"})
+        self.assertEqual(self.patch(1, {"title" : "가" * 201}).json(), {"MESSAGE" : "TITLE_TOO_LONG"})
+        self.assertEqual(self.patch(99, {"title" : "수정"}).status_code, 404)
+
+        response = self.patch(1, {"title" : "수정"}, user_id = 2)
+
+        self.assertEqual((response.status_code, response.json()), (401, {"MESSAGE" : "NO_PERMISSION"}))
+        self.assertEqual(Post.objects.get(id = 1).title, "테스트 1번")
+
+    @override_settings(POST_CACHE_LOCAL_TIMEOUT = 0)
+    def test_post_feed_local_copy_expires(self):
+        get_feed()
+
+        # Another worker's write: this process never sees the stamp move and
+        # only notices once the shared snapshot has expired.
+        Post.objects.filter(id = 1).update(title = "수정")
+        cache.delete(FEED_KEY)
+
+        self.assertEqual(get_feed()["posts"][0]["title"], "수정")
+
+    def test_patch_feed_ignores_older_write(self):
+        now = datetime.datetime.now()
+        get_feed()
+
+        Post.objects.filter(id = 1).update(title = "나중 수정", updated_at = now)
+        patch_feed(1, title = "나중 수정", updated_at = now)
+        patch_feed(1, title = "먼저 수정", updated_at = now - datetime.timedelta(seconds = 1))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_feed()["posts"][0]["title"], "나중 수정")
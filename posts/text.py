@@ -0,0 +1,18 @@
+EXCERPT_LENGTH = 150
+
+
+# Kept free of Django imports so core.fakedata can build excerpts in its
+# worker processes.
+def make_excerpt(content, length = EXCERPT_LENGTH):
+    text = ' '.join(content.split())
+
+    if len(text) <= length:
+        return text
+
+    cut   = text[:length]
+    space = cut.rfind(' ')
+
+    if space > length // 2:
+        cut = cut[:space]
+
+    return cut.rstrip() + '…'
@@ -1,9 +1,12 @@
 from django.urls import path
 
-from .views import PostView, PostListView
+from .views import PostView, PostBulkView, PostExportView, PostListView, PostSearchView
 
 urlpatterns = [
     path('', PostView.as_view()),
     path('/<int:post_id>', PostView.as_view()),
+    path('/bulk', PostBulkView.as_view()),
+    path('/export', PostExportView.as_view()),
+    path('/search', PostSearchView.as_view()),
     path('/list', PostListView.as_view())
     ]
\ No newline at end of file
@@ -1,13 +1,31 @@
 import json
 
-from django.http.response import JsonResponse
+from django.conf          import settings
+from django.db            import connections, router, transaction
+from django.db.models     import BooleanField, Case, Q, Value, When
+from django.http.response import JsonResponse, StreamingHttpResponse
+from django.utils         import timezone
 from django.views         import View
 
+from core.http        import is_conditional, not_modified, set_validators
+from core.microcache  import purge_microcache
+from users.cache      import get_user
 from users.decorators import login_decorator
+from users.models     import User
+from .cache           import get_post, get_post_validators, get_posts, invalidate_post, page_etag
+from .counters        import GLOBAL_SCOPE, get_total, user_scope, with_total
+from .export          import export_chunks, parse_since
+from .feed            import bump_feed, get_feed, patch_feed
 from .models          import Post
+from .pagination      import InvalidCursor, InvalidLimit, decode_cursor, encode_cursor, parse_limit
+from .text            import make_excerpt
+from .search          import search_posts
+from .signals         import post_changed
 
 
 class PostView(View):
+    patch_fields = ('title', 'content')
+
     @login_decorator
     def post(self, request):
         try:
@@ -16,6 +34,9 @@ class PostView(View):
             title   = data['title']
             content = data['content']
 
+            if not isinstance(title, str) or not isinstance(content, str):
+                return JsonResponse({'MESSAGE' : 'VALUE_ERROR'}, status = 400)
+
             post = Post.objects.create(
                 author  = user.name,
                 title   = title,
@@ -23,41 +44,67 @@ class PostView(View):
                 user    = user
             )
 
-            result = {
-                'author'     : post.author,
-                'title'      : post.title,
-                'content'    : post.content,
-                'created_at' : post.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            }
-
-            return JsonResponse({'MESSAGE' : 'SUCCESS', 'RESULT' : result},status = 201)
+            return JsonResponse({'MESSAGE' : 'SUCCESS', 'RESULT' : post.to_dict()},status = 201)
         
         except KeyError:
             return JsonResponse({'MESSAGE' : 'KEY_ERROR'}, status = 400)
 
-    def get(self,request,post_id):
-        if not Post.objects.filter(id = post_id).exists():
-            return JsonResponse({'MESSAGE' : 'DOSE_NOT_EXIST_POST'}, status = 404)
+    def get(self,request,post_id = None):
+        if post_id is None:
+            return self.get_many(request)
 
-        post = Post.objects.get(id = post_id)
+        if is_conditional(request):
+            validators = get_post_validators(post_id)
 
-        result = {
-                'author'     : post.author,
-                'title'      : post.title,
-                'content'    : post.content,
-                'created_at' : post.created_at.strftime('%Y-%m-%d %H:%M:%S')
-        }
+            if validators is None:
+                return JsonResponse({'MESSAGE' : 'DOSE_NOT_EXIST_POST'}, status = 404)
+
+            response = not_modified(request, *validators)
+
+            if response:
+                return response
+
+        entry = get_post(post_id)
 
-        return JsonResponse({"RESULT" : result}, status = 200)
+        if entry is None:
+            return JsonResponse({'MESSAGE' : 'DOSE_NOT_EXIST_POST'}, status = 404)
+
+        response = JsonResponse({"RESULT" : entry['result']}, status = 200)
+
+        return set_validators(response, entry['etag'], entry['last_modified'])
     
+    def get_many(self, request):
+        try:
+            post_ids = list(dict.fromkeys(int(post_id) for post_id in request.GET['ids'].split(',')))
+        except KeyError:
+            return JsonResponse({'MESSAGE' : 'KEY_ERROR'}, status = 400)
+        except ValueError:
+            return JsonResponse({'MESSAGE' : 'NOT_INT'}, status = 400)
+
+        if len(post_ids) > settings.POST_BATCH_MAX_IDS:
+            return JsonResponse({'MESSAGE' : 'TOO_MANY_IDS'}, status = 400)
+
+        entries = get_posts(post_ids)
+        result  = [dict(entries[post_id]['result'], id = post_id) for post_id in post_ids if post_id in entries]
+        missing = [post_id for post_id in post_ids if post_id not in entries]
+
+        return JsonResponse({"RESULT" : result, "MISSING" : missing}, status = 200)
+
     @login_decorator
     def delete(self, request, post_id):
-        if not Post.objects.filter(id = post_id).exists():
-            return JsonResponse({"MESSAGE" : "DOSE_NOT_EXIST_POST"}, status = 404)
-        if Post.objects.get(id = post_id).user.id != request.user.id:
-            return JsonResponse({"MESSAGE" : "NO_PERMISSION"}, status = 403)
+        # A plain DELETE instead of QuerySet.delete(), which would first load
+        # the row to collect cascades and send signals. Nothing cascades from
+        # posts, and post_changed() does what the post_delete receiver would.
+        with connections[router.db_for_write(Post)].cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {Post._meta.db_table} WHERE id = %s AND user_id = %s', [post_id, request.user.id]
+            )
+            deleted = cursor.rowcount
+
+        if not deleted:
+            return self.write_failed(post_id, no_permission_status = 403)
 
-        Post.objects.filter(id = post_id).delete()
+        post_changed(post_id)
 
         return JsonResponse({"MESSAGE" : "DELETED"}, status = 200)
 
@@ -68,15 +115,23 @@ class PostView(View):
             title   = data['title']
             content = data['content']
 
-            if not Post.objects.filter(id = post_id).exists():
-                return JsonResponse({"MESSAGE" : "DOSE_NOT_EXIST_POST"}, status = 404)
-            if Post.objects.get(id = post_id).user.id != request.user.id:
-                return JsonResponse({"MESSAGE" : "NO_PERMISSION"}, status = 401)
+            if not isinstance(title, str) or not isinstance(content, str):
+                return JsonResponse({'MESSAGE' : 'VALUE_ERROR'}, status = 400)
 
-            post = Post.objects.filter(id = post_id).update(
-                title   = title,
-                content = content
-            )
+            changes = {
+                'title'      : title,
+                'content'    : content,
+                'excerpt'    : make_excerpt(content),
+                'updated_at' : timezone.now(),
+            }
+            updated = Post.objects.filter(id = post_id, user_id = request.user.id).update(**changes)
+
+            if not updated:
+                return self.write_failed(post_id, no_permission_status = 401)
+
+            invalidate_post(post_id)
+            patch_feed(post_id, **changes)
+            purge_microcache()
 
             return JsonResponse({"MESSAGE" : "SUCCESS"}, status = 201)
 
@@ -85,23 +140,337 @@ class PostView(View):
         except ValueError:
             return JsonResponse({'MESSAGE' : 'VALUE_ERROR'}, status = 400)
 
+    @login_decorator
+    def patch(self, request, post_id):
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({'MESSAGE' : 'VALUE_ERROR'}, status = 400)
+
+        if not isinstance(data, dict):
+            return JsonResponse({'MESSAGE' : 'VALUE_ERROR'}, status = 400)
+
+        fields = {field : data[field] for field in self.patch_fields if field in data}
+
+        if not fields:
+            return JsonResponse({'MESSAGE' : 'KEY_ERROR'}, status = 400)
+
+        if not all(isinstance(value, str) for value in fields.values()):
+            return JsonResponse({'MESSAGE' : 'VALUE_ERROR'}, status = 400)
+
+        if len(fields.get('title', '')) > Post._meta.get_field('title').max_length:
+            return JsonResponse({'MESSAGE' : 'TITLE_TOO_LONG'}, status = 400)
+
+        # The comparison runs in SQL, so only one flag per field comes back
+        # instead of a possibly large content column.
+        flags = {
+            f'{field}_changed' : Case(When(**{field : value}, then = Value(False)), default = Value(True), output_field = BooleanField())
+            for field, value in fields.items()
+        }
+        row   = Post.objects.using(router.db_for_write(Post)).filter(id = post_id).annotate(**flags).values('user_id', *flags).first()
+
+        if row is None:
+            return JsonResponse({"MESSAGE" : "DOSE_NOT_EXIST_POST"}, status = 404)
+
+        if row['user_id'] != request.user.id:
+            return JsonResponse({"MESSAGE" : "NO_PERMISSION"}, status = 401)
+
+        changes = {field : value for field, value in fields.items() if row[f'{field}_changed']}
+
+        if not changes:
+            return JsonResponse({'MESSAGE' : 'NOT_CHANGED'}, status = 200)
+
+        if 'content' in changes:
+            changes['excerpt'] = make_excerpt(changes['content'])
+
+        changes['updated_at'] = timezone.now()
+        updated               = Post.objects.filter(id = post_id, user_id = request.user.id).update(**changes)
+
+        if not updated:
+            return self.write_failed(post_id, no_permission_status = 401)
+
+        invalidate_post(post_id)
+        patch_feed(post_id, **changes)
+        purge_microcache()
+
+        return JsonResponse({"MESSAGE" : "SUCCESS"}, status = 201)
+
+    def write_failed(self, post_id, no_permission_status):
+        if Post.objects.filter(id = post_id).exists():
+            return JsonResponse({"MESSAGE" : "NO_PERMISSION"}, status = no_permission_status)
+
+        return JsonResponse({"MESSAGE" : "DOSE_NOT_EXIST_POST"}, status = 404)
+
+class PostBulkView(View):
+    @login_decorator
+    def post(self, request):
+        try:
+            items = self.parse(request)
+
+            if not isinstance(items, list):
+                return JsonResponse({'MESSAGE' : 'VALUE_ERROR'}, status = 400)
+
+            if len(items) > settings.POST_BULK_MAX_ITEMS:
+                return JsonResponse({'MESSAGE' : 'TOO_MANY_ITEMS'}, status = 400)
+
+            user   = request.user
+            posts  = []
+            errors = []
+
+            for index, item in enumerate(items):
+                error = self.validate(item)
+
+                if error:
+                    errors.append({'index' : index, 'MESSAGE' : error})
+                    continue
+
+                posts.append(Post(
+                    author  = user.name,
+                    title   = item['title'],
+                    content = item['content'],
+                    user    = user
+                ))
+
+            if errors:
+                return JsonResponse({'MESSAGE' : 'INVALID_ITEMS', 'ERRORS' : errors}, status = 400)
+
+            with transaction.atomic():
+                Post.objects.bulk_create(posts, batch_size = settings.POST_BULK_BATCH_SIZE)
+
+            bump_feed()
+            purge_microcache()
+
+            return JsonResponse({'MESSAGE' : 'SUCCESS', 'count' : len(posts)}, status = 201)
+
+        except ValueError:
+            return JsonResponse({'MESSAGE' : 'VALUE_ERROR'}, status = 400)
+
+    def parse(self, request):
+        if request.content_type in ('application/x-ndjson', 'application/ndjson'):
+            return [json.loads(line) for line in request.body.decode('utf-8').splitlines() if line.strip()]
+
+        return json.loads(request.body)
+
+    def validate(self, item):
+        if not isinstance(item, dict) or 'title' not in item or 'content' not in item:
+            return 'KEY_ERROR'
+
+        if not isinstance(item['title'], str) or not isinstance(item['content'], str):
+            return 'VALUE_ERROR'
+
+        if len(item['title']) > Post._meta.get_field('title').max_length:
+            return 'TITLE_TOO_LONG'
+
+class PostExportView(View):
+    def get(self, request):
+        try:
+            since = parse_since(request.GET.get('since'))
+        except ValueError:
+            return JsonResponse({'MESSAGE' : 'INVALID_SINCE'}, status = 400)
+
+        return StreamingHttpResponse(export_chunks(since), content_type = 'application/x-ndjson')
+
+class PostSearchView(View):
+    def get(self, request):
+        try:
+            query  = request.GET.get('q', '').strip()
+            limit  = parse_limit(request.GET.get('limit'))
+            cursor = request.GET.get('cursor')
+
+            if not query:
+                return JsonResponse({'MESSAGE' : 'EMPTY_VALUE'}, status = 400)
+
+            after = decode_cursor(cursor, (float, int)) if cursor else None
+
+        except InvalidCursor:
+            return JsonResponse({'MESSAGE' : 'INVALID_CURSOR'}, status = 400)
+        except InvalidLimit:
+            return JsonResponse({'MESSAGE' : 'INVALID_LIMIT'}, status = 400)
+        except ValueError:
+            return JsonResponse({'MESSAGE' : 'NOT_INT'}, status = 400)
+
+        posts       = search_posts(query, limit + 1, after)
+        next_cursor = None
+
+        if len(posts) > limit:
+            posts       = posts[:limit]
+            next_cursor = encode_cursor(posts[-1].score, posts[-1].id) if posts else None
+
+        result = [dict(post.to_dict(), id = post.id) for post in posts]
+
+        return JsonResponse({"count" : len(result), "RESULT" : result, "next_cursor" : next_cursor}, status = 200)
+
 class PostListView(View):
+    ordering = ('created_at', 'id')
+    fields   = None
+
     def get(self,request):
         try:
+            limit = parse_limit(request.GET.get('limit'))
+            error = self.set_fields(request)
+
+            if error:
+                return error
+
+            if 'cursor' in request.GET:
+                return self.get_by_cursor(request, limit)
+
             offset = int(request.GET.get('offset', 0))
-            limit  = int(request.GET.get('limit', 5))
-            
-            posts = Post.objects.all()[offset:offset+limit]
-            count = len(posts)
+
+            if offset < 0:
+                raise ValueError(offset)
+
+            if offset == 0 and limit <= settings.POST_FEED_SIZE:
+                return self.get_first_page(request, limit)
             
-            result = [{
-                'author'     : post.user.name,
-                'title'      : post.title,
-                'content'    : post.content,
-                'created_at' : post.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            }for post in posts]
+            posts    = self.project(with_total(Post.objects.order_by(*self.ordering), self.count_scope()))
+            posts    = posts[offset:offset+limit]
+            response = self.not_modified(request, posts)
+
+            if response:
+                return response
+
+            posts  = list(posts)
+            count  = len(posts)
+            total  = self.total(posts)
+            result = [self.serialize(post) for post in posts]
+
+            response = JsonResponse({ "count" : count, "total" : total, "RESULT" : result}, status = 200)
+
+            return set_validators(response, page_etag(((post.id, post.updated_at) for post in posts), total))
+
+        except InvalidLimit:
+            return JsonResponse({'MESSAGE' : 'INVALID_LIMIT'}, status = 400)
+        except ValueError:
+            return JsonResponse({'MESSAGE' : 'NOT_INT'}, status = 400)
+
+    # The first page comes from the shared feed snapshot, without a query
+    # while the snapshot is current.
+    def get_first_page(self, request, limit):
+        feed     = get_feed()
+        posts    = feed['posts'][:limit]
+        etag     = page_etag(((post['id'], post['updated_at']) for post in posts), feed['total'])
+        response = not_modified(request, etag) if is_conditional(request) else None
+
+        if response:
+            return response
 
-            return JsonResponse({ "count" : count, "RESULT" : result}, status = 200)
+        fields = self.fields or Post.DEFAULT_FIELDS
+        result = [{field : post[field] for field in fields} for post in posts]
 
+        response = JsonResponse({"count" : len(result), "total" : feed['total'], "RESULT" : result}, status = 200)
+
+        return set_validators(response, etag)
+
+    def set_fields(self, request):
+        fields = request.GET.get('fields')
+
+        if not fields:
+            return
+
+        fields = list(dict.fromkeys(field.strip() for field in fields.split(',')))
+
+        if not set(fields) <= set(Post.LIST_FIELDS):
+            return JsonResponse({'MESSAGE' : 'INVALID_FIELDS'}, status = 400)
+
+        self.fields = fields
+
+    # Only the requested columns plus the keyset/ETag columns are selected.
+    def project(self, posts):
+        if self.fields is None:
+            return posts
+
+        return posts.only('created_at', 'updated_at', *(field for field in self.fields if field != 'id'))
+
+    def get_by_cursor(self, request, limit, posts = None):
+        descending = self.ordering[0].startswith('-')
+        posts      = with_total(Post.objects.all() if posts is None else posts, self.count_scope()).order_by(*self.ordering)
+        posts      = self.project(posts)
+        cursor     = request.GET.get('cursor')
+
+        if cursor:
+            try:
+                created_at, post_id = decode_cursor(cursor)
+            except InvalidCursor:
+                return JsonResponse({'MESSAGE' : 'INVALID_CURSOR'}, status = 400)
+
+            if descending:
+                posts = posts.filter(Q(created_at__lt = created_at) | Q(created_at = created_at, id__lt = post_id))
+            else:
+                posts = posts.filter(Q(created_at__gt = created_at) | Q(created_at = created_at, id__gt = post_id))
+
+        posts    = posts[:limit + 1]
+        response = self.not_modified(request, posts)
+
+        if response:
+            return response
+
+        posts       = list(posts)
+        total       = self.total(posts)
+        etag        = page_etag(((post.id, post.updated_at) for post in posts), total)
+        next_cursor = None
+
+        if len(posts) > limit:
+            posts       = posts[:limit]
+            next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id) if posts else None
+
+        result = [self.serialize(post) for post in posts]
+
+        response = JsonResponse(
+            {"count" : len(result), "total" : total, "RESULT" : result, "next_cursor" : next_cursor}, status = 200
+        )
+
+        return set_validators(response, etag)
+
+    def serialize(self, post):
+        return post.to_dict(self.fields or Post.DEFAULT_FIELDS)
+
+    def count_scope(self):
+        return GLOBAL_SCOPE
+
+    # The counter is read by a scalar subquery in the page query itself; only
+    # an empty page needs a separate lookup.
+    def total(self, posts):
+        if posts:
+            return posts[0].total or 0
+
+        return get_total(self.count_scope())
+
+    def not_modified(self, request, posts):
+        if is_conditional(request):
+            rows  = list(posts.values_list('id', 'updated_at', 'total'))
+            total = rows[0][2] or 0 if rows else get_total(self.count_scope())
+
+            return not_modified(request, page_etag([(post_id, updated_at) for post_id, updated_at, _ in rows], total))
+
+class UserPostListView(PostListView):
+    ordering = ('-created_at', '-id')
+
+    def get(self, request, user_id):
+        try:
+            limit = parse_limit(request.GET.get('limit'))
+        except InvalidLimit:
+            return JsonResponse({'MESSAGE' : 'INVALID_LIMIT'}, status = 400)
         except ValueError:
-            return JsonResponse({'MESSAGE' : 'NOT_INT'}, status = 400)
\ No newline at end of file
+            return JsonResponse({'MESSAGE' : 'NOT_INT'}, status = 400)
+
+        error = self.set_fields(request)
+
+        if error:
+            return error
+
+        try:
+            get_user(user_id)
+        except User.DoesNotExist:
+            return JsonResponse({'MESSAGE' : 'DOSE_NOT_EXIST_USER'}, status = 404)
+
+        return self.get_by_cursor(request, limit, Post.objects.filter(user_id = user_id))
+
+    def serialize(self, post):
+        if self.fields:
+            return post.to_dict(self.fields)
+
+        return dict(post.to_dict(), id = post.id)
+
+    def count_scope(self):
+        return user_scope(self.kwargs['user_id'])
@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        from core.metrics import collector
+        from . import signals
+        from .cache import identity_cache_stats
+
+        collector.register_counter(
+            'wanted_identity_cache_hits_total', 'Identity cache hits.', lambda: identity_cache_stats()['hits']
+        )
+        collector.register_counter(
+            'wanted_identity_cache_misses_total', 'Identity cache misses.', lambda: identity_cache_stats()['misses']
+        )
@@ -0,0 +1,47 @@
+import threading
+
+from django.conf       import settings
+from django.core.cache import caches
+
+from core.routers import get_with_primary_fallback
+from .models      import User
+
+
+_stats_lock = threading.Lock()
+_stats      = {'hits' : 0, 'misses' : 0}
+
+
+def _identity_cache():
+    return caches[settings.IDENTITY_CACHE_ALIAS]
+
+
+def _identity_key(user_id):
+    return f'identity:user:{user_id}'
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def get_user(user_id):
+    user = _identity_cache().get(_identity_key(user_id))
+
+    if user is not None:
+        _count('hits')
+        return user
+
+    _count('misses')
+    user = get_with_primary_fallback(User.objects, id = user_id)
+    _identity_cache().set(_identity_key(user_id), user, settings.IDENTITY_CACHE_TIMEOUT)
+
+    return user
+
+
+def invalidate_user(user_id):
+    _identity_cache().delete(_identity_key(user_id))
+
+
+def identity_cache_stats():
+    with _stats_lock:
+        return dict(_stats)
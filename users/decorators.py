@@ -3,18 +3,23 @@ import jwt
 from django.conf import settings
 from django.http import JsonResponse
 
+from .cache  import get_user
 from .models import User
 
+def authenticate(request):
+    access_token = request.headers.get('Authorization', None)
+    token = jwt.decode(access_token, settings.SECRET_KEY, algorithms='HS256')
+    return get_user(token['id'])
+
 def login_decorator(func):
     def wraper(self, request, *args, **kwargs):
         try:
-            access_token = request.headers.get('Authorization', None)
-            token = jwt.decode(access_token, settings.SECRET_KEY, algorithms='HS256')
-            user = User.objects.get(id=token['id'])
-            request.user = user
+            # POST /batch resolves the user once and hands it to every sub-request.
+            if not isinstance(getattr(request, 'user', None), User):
+                request.user = authenticate(request)
         except jwt.exceptions.DecodeError:
             return JsonResponse({'MESSAGE': 'ENCODE_ERROR'}, status=401)
         except User.DoesNotExist:
             return JsonResponse({'MESSAGE': 'INVALID_USER'}, status=401)
         return func(self, request, *args, **kwargs)
-    return wraper
\ No newline at end of file
+    return wraper
@@ -0,0 +1,65 @@
+import asyncio
+import multiprocessing
+import threading
+import bcrypt
+
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+
+class PasswordPoolBusy(Exception):
+    pass
+
+
+_executor      = None
+_executor_lock = threading.Lock()
+_pending       = 0
+_pending_lock  = threading.Lock()
+
+
+def hash_password(password):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+
+def check_password(password, hashed_password):
+    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+def _get_executor():
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers = settings.PASSWORD_POOL_WORKERS,
+                mp_context  = multiprocessing.get_context('spawn'),
+            )
+
+        return _executor
+
+
+async def _run_in_pool(func, *args):
+    global _pending
+
+    with _pending_lock:
+        if _pending >= settings.PASSWORD_POOL_MAX_PENDING:
+            raise PasswordPoolBusy
+        _pending += 1
+
+    try:
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(_get_executor(), func, *args)
+
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+
+async def hash_password_async(password):
+    return await _run_in_pool(hash_password, password)
+
+
+async def check_password_async(password, hashed_password):
+    return await _run_in_pool(check_password, password, hashed_password)
@@ -1,12 +1,29 @@
+import asyncio
 import json
+import threading
+import jwt
 import bcrypt
 
-from django.test import TestCase, Client
+from django.core.cache import cache
+from django.http       import JsonResponse
+from django.test       import TestCase, Client, RequestFactory, AsyncClient, AsyncRequestFactory, override_settings
+from django.urls       import include, path
 
-from unittest.mock import MagicMock, patch
-from .models       import User
+from unittest.mock   import MagicMock, patch
+from wanted.settings import SECRET_KEY
+from .cache          import identity_cache_stats
+from .decorators     import login_decorator
+from .models         import User
+from .views          import AsyncSignInView, AsyncSignUpView
 
 
+# The URLconf wanted/asgi.py serves: the async auth views next to the posts.
+class AsyncAuthURLConf:
+    urlpatterns = [
+        path('users/sign-in', AsyncSignInView.as_view()),
+        path('posts', include('posts.urls')),
+    ]
+
 class SignUpTest(TestCase):
     def setUp(self):
         User.objects.bulk_create(
@@ -147,6 +164,19 @@ class SignUpTest(TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.json(), {"MESSAGE" : "KEY_ERROR"})
 
+    def test_signup_view_query_budget(self):
+        user = {
+            "name"           : "wooju3",
+            "email"          : "zkzkxls123@naver.com",
+            "password"       : "wooju111!@",
+            "check_password" : "wooju111!@"
+        }
+
+        client = Client()
+
+        with self.assertNumQueries(2):
+            client.post("/users/sign-up", json.dumps(user), content_type = "application/json")
+
 class SignInTest(TestCase):
     def setUp(self):
         password = "wooju123!!"
@@ -238,4 +268,221 @@ class SignInTest(TestCase):
         )
 
         self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.json(), {"MESSAGE" : "KEY_ERROR"})
\ No newline at end of file
+        self.assertEqual(response.json(), {"MESSAGE" : "KEY_ERROR"})
+
+    def test_signin_view_query_budget(self):
+        user = {
+            "email"    : "zkzkxls@abc.com",
+            "password" : "wooju123!!",
+        }
+
+        client = Client()
+
+        with self.assertNumQueries(1):
+            client.post("/users/sign-in", json.dumps(user), content_type = "application/json")
+
+class LoginDecoratorTest(TestCase):
+    class WhoAmIView:
+        @login_decorator
+        def post(self, request):
+            return JsonResponse({'NAME' : request.user.name}, status = 200)
+
+    def setUp(self):
+        cache.clear()
+        User.objects.create(
+                    id       = 1,
+                    name     = "wooju",
+                    email    = "zkzkxls@abc.com",
+                    password = "wooju123!!"
+                )
+        self.header = {"HTTP_AUTHORIZATION" : jwt.encode({'id' : 1}, SECRET_KEY, algorithm = "HS256")}
+
+    def tearDown(self):
+        User.objects.all().delete()
+
+    def whoami(self):
+        request = RequestFactory().post("/whoami", **self.header)
+
+        return self.WhoAmIView().post(request)
+
+    def test_login_decorator_cached_identity(self):
+        self.whoami()
+
+        with self.assertNumQueries(0):
+            response = self.whoami()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), {'NAME' : 'wooju'})
+
+    def test_login_decorator_cache_stats(self):
+        before = identity_cache_stats()
+
+        self.whoami()
+        self.whoami()
+
+        after = identity_cache_stats()
+
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 1)
+
+    def test_login_decorator_invalidated_on_save(self):
+        self.whoami()
+
+        user      = User.objects.get(id = 1)
+        user.name = "wooju7"
+        user.save()
+
+        self.assertEqual(json.loads(self.whoami().content), {'NAME' : 'wooju7'})
+
+    def test_login_decorator_invalidated_on_delete(self):
+        self.whoami()
+
+        User.objects.filter(id = 1).delete()
+
+        response = self.whoami()
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(json.loads(response.content), {'MESSAGE' : 'INVALID_USER'})
+
+class AsyncSignInTest(TestCase):
+    def setUp(self):
+        password        = "wooju123!!"
+        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        User.objects.create(
+                    id       = 1,
+                    name     = "wooju",
+                    email    = "zkzkxls@abc.com",
+                    password = hashed_password
+                )
+
+    def tearDown(self):
+        User.objects.all().delete()
+
+    def sign_in(self, user):
+        request = AsyncRequestFactory().post(
+            "/users/sign-in", json.dumps(user), content_type = "application/json"
+        )
+
+        return AsyncSignInView.as_view()(request)
+
+    def test_async_signin_view_is_coroutine(self):
+        self.assertTrue(asyncio.iscoroutinefunction(AsyncSignInView.as_view()))
+        self.assertTrue(asyncio.iscoroutinefunction(AsyncSignUpView.as_view()))
+
+    async def test_async_signin_view_method_not_allowed(self):
+        for method in ("get", "put", "delete"):
+            request  = getattr(AsyncRequestFactory(), method)("/users/sign-in")
+            response = await AsyncSignInView.as_view()(request)
+
+            self.assertEqual(response.status_code, 405)
+
+        response = await AsyncSignUpView.as_view()(AsyncRequestFactory().get("/users/sign-up"))
+
+        self.assertEqual(response.status_code, 405)
+
+    async def test_async_signin_view_success(self):
+        response = await self.sign_in({"email" : "zkzkxls@abc.com", "password" : "wooju123!!"})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            jwt.decode(json.loads(response.content)['TOKEN'], SECRET_KEY, algorithms = "HS256"),
+            {'id' : 1}
+        )
+
+    async def test_async_signin_view_invalid_password(self):
+        response = await self.sign_in({"email" : "zkzkxls@abc.com", "password" : "wooju123@"})
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(json.loads(response.content), {"MESSAGE" : "INVALID_PASSWORD"})
+
+    async def test_async_signin_view_not_exist_user(self):
+        response = await self.sign_in({"email" : "zkzkxls@naver.com", "password" : "wooju123!!"})
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(json.loads(response.content), {"MESSAGE" : "USER_DOES_NOT_EXIST"})
+
+    @override_settings(PASSWORD_POOL_MAX_PENDING = 0)
+    async def test_async_signin_view_pool_busy(self):
+        response = await self.sign_in({"email" : "zkzkxls@abc.com", "password" : "wooju123!!"})
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(json.loads(response.content), {"MESSAGE" : "SERVER_BUSY"})
+
+    async def test_async_signup_view_create_success(self):
+        user = {
+            "name"           : "wooju3",
+            "email"          : "zkzkxls123@naver.com",
+            "password"       : "wooju111!@",
+            "check_password" : "wooju111!@"
+        }
+
+        request  = AsyncRequestFactory().post(
+            "/users/sign-up", json.dumps(user), content_type = "application/json"
+        )
+        response = await AsyncSignUpView.as_view()(request)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(json.loads(response.content), {"MESSAGE" : "SUCCESS"})
+
+        response = await self.sign_in({"email" : "zkzkxls123@naver.com", "password" : "wooju111!@"})
+
+        self.assertEqual(response.status_code, 201)
+
+
+@override_settings(ROOT_URLCONF = AsyncAuthURLConf)
+class AsyncSignInStackTest(TestCase):
+    def setUp(self):
+        User.objects.create(
+                    id       = 1,
+                    name     = "wooju",
+                    email    = "zkzkxls@abc.com",
+                    password = bcrypt.hashpw("wooju123!!".encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+                )
+
+    def tearDown(self):
+        User.objects.all().delete()
+
+    async def test_async_signin_through_middleware_stack(self):
+        response = await AsyncClient().post(
+            "/users/sign-in",
+            json.dumps({"email" : "zkzkxls@abc.com", "password" : "wooju123!!"}),
+            content_type = "application/json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            jwt.decode(json.loads(response.content)['TOKEN'], SECRET_KEY, algorithms = "HS256"),
+            {'id' : 1}
+        )
+        self.assertIn("Server-Timing", response)
+
+    async def test_read_completes_while_signin_waits_on_password_pool(self):
+        started  = threading.Event()
+        released = threading.Event()
+
+        async def check_password_async(password, hashed_password):
+            started.set()
+            await asyncio.get_running_loop().run_in_executor(None, released.wait, 5)
+
+            return True
+
+        client = AsyncClient()
+
+        with patch("users.views.check_password_async", check_password_async):
+            sign_in = asyncio.ensure_future(client.post(
+                "/users/sign-in",
+                json.dumps({"email" : "zkzkxls@abc.com", "password" : "wooju123!!"}),
+                content_type = "application/json",
+            ))
+
+            try:
+                self.assertTrue(await asyncio.get_running_loop().run_in_executor(None, started.wait, 5))
+
+                response = await asyncio.wait_for(client.get("/posts/list?offset=0&limit=5"), 2)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertFalse(sign_in.done())
+            finally:
+                released.set()
+
+            self.assertEqual((await sign_in).status_code, 201)
@@ -1,8 +1,18 @@
+from django.conf import settings
 from django.urls import path
 
-from users.views import SignUpView, SignInView
+from posts.views import UserPostListView
+from users.views import AsyncSignInView, AsyncSignUpView, SignUpView, SignInView
 
-urlpatterns = [
-    path('/sign-up', SignUpView.as_view()),
-    path('/sign-in', SignInView.as_view()),
-]
\ No newline at end of file
+if settings.ASYNC_AUTH_VIEWS:
+    urlpatterns = [
+        path('/sign-up', AsyncSignUpView.as_view()),
+        path('/sign-in', AsyncSignInView.as_view()),
+    ]
+else:
+    urlpatterns = [
+        path('/sign-up', SignUpView.as_view()),
+        path('/sign-in', SignInView.as_view()),
+    ]
+
+urlpatterns.append(path('/<int:user_id>/posts', UserPostListView.as_view()))
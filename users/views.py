@@ -1,78 +1,145 @@
 import json
 import re
 import jwt
-import bcrypt
 
+from asgiref.sync import sync_to_async
 from django.http  import JsonResponse
 from django.views import View
 
+from core.routers    import get_with_primary_fallback, primary
+from core.views      import AsyncView
 from wanted.settings import SECRET_KEY
+from .hashing        import (
+    PasswordPoolBusy, check_password, check_password_async, hash_password, hash_password_async
+)
 from .models         import User
 
 
 class SignUpView(View):
     def post(self, request):
         try:
-            data           = json.loads(request.body)
-            name           = data['name']
-            email          = data['email']
-            password       = data['password']
-            check_password = data['check_password']
-            regex_email    = re.compile('^[a-zA-Z\d+-_.]+@[a-zA-Z\d]+\.[a-zA-Z\d+-.]+$')
-            regex_password = re.compile('^(?=.*[a-zA-Z])(?=.*[\d])(?=.*[~!@#$%^&*_+])[a-zA-Z\d~!@#$%^&*_+]{8,}$')
+            data  = json.loads(request.body)
+            error = self.validate(data)
 
-            if not (name and email and password and check_password):
-                return JsonResponse({'MESSAGE' : 'EMPTY_VALUE'}, status = 400)
+            if error:
+                return error
 
-            if not regex_email.match(email):
-                return JsonResponse({'MESSAGE' : 'EMAIL_VALIDATION'}, status = 400)
+            hashed_password = hash_password(data['password'])
 
-            if not regex_password.match(password):
-                return JsonResponse({'MESSAGE' : 'PASSWORD_VALIDATION'}, status = 400)
+            user = User.objects.create(
+                name     = data['name'],
+                email    = data['email'],
+                password = hashed_password,
+                )
 
-            if User.objects.filter(email = email).exists():
-                return JsonResponse({'MESSAGE' : 'ALREADY_EXISTED_EAMIL'}, status = 400)
+            return JsonResponse({'MESSAGE' : 'SUCCESS'}, status = 201)
 
-            if not password == check_password:
-                return JsonResponse({'MESSAGE' : 'PASSWORD_NOT_CORRECT'}, status = 400)
+        except KeyError:
+            return JsonResponse({'MESSAGE' : 'KEY_ERROR'}, status = 400)
+        except ValueError:
+            return JsonResponse({'MESSAGE' : 'VALUE_ERROR'}, status = 400)
 
-            hashed_password  = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    def validate(self, data):
+        name           = data['name']
+        email          = data['email']
+        password       = data['password']
+        check_password = data['check_password']
+        regex_email    = re.compile('^[a-zA-Z\d+-_.]+@[a-zA-Z\d]+\.[a-zA-Z\d+-.]+$')
+        regex_password = re.compile('^(?=.*[a-zA-Z])(?=.*[\d])(?=.*[~!@#$%^&*_+])[a-zA-Z\d~!@#$%^&*_+]{8,}$')
 
-            user = User.objects.create(
-                name     = name,
-                email    = email,
+        if not (name and email and password and check_password):
+            return JsonResponse({'MESSAGE' : 'EMPTY_VALUE'}, status = 400)
+
+        if not regex_email.match(email):
+            return JsonResponse({'MESSAGE' : 'EMAIL_VALIDATION'}, status = 400)
+
+        if not regex_password.match(password):
+            return JsonResponse({'MESSAGE' : 'PASSWORD_VALIDATION'}, status = 400)
+
+        if User.objects.using(primary()).filter(email = email).exists():
+            return JsonResponse({'MESSAGE' : 'ALREADY_EXISTED_EAMIL'}, status = 400)
+
+        if not password == check_password:
+            return JsonResponse({'MESSAGE' : 'PASSWORD_NOT_CORRECT'}, status = 400)
+
+class SignInView(View):
+    def post(self, request):
+        try:
+            data = json.loads(request.body)
+            user = self.find_user(data)
+
+            if isinstance(user, JsonResponse):
+                return user
+
+            if not check_password(data['password'], user.password):
+                return JsonResponse({'MESSAGE' : 'INVALID_PASSWORD'}, status = 401)
+
+            return self.issue_token(user)
+
+        except KeyError:
+            return JsonResponse({'MESSAGE' : 'KEY_ERROR'}, status = 400)
+        except ValueError:
+            return JsonResponse({'MESSAGE' : 'VALUE_ERROR'}, status = 400)
+
+    def find_user(self, data):
+        email    = data['email']
+        password = data['password']
+
+        if not (email and password):
+            return JsonResponse({'MESSAGE' : 'EMPTY_VALUE'}, status = 400)
+
+        try:
+            return get_with_primary_fallback(User.objects, email = email)
+        except User.DoesNotExist:
+            return JsonResponse({'MESSAGE' : 'USER_DOES_NOT_EXIST'}, status = 401)
+
+    def issue_token(self, user):
+        token = jwt.encode({'id' : user.id}, SECRET_KEY, algorithm = 'HS256')
+
+        return JsonResponse({'MESSAGE' : 'SUCCESS', 'TOKEN' : token}, status = 201)
+
+class AsyncSignUpView(AsyncView, SignUpView):
+    async def post(self, request):
+        try:
+            data  = json.loads(request.body)
+            error = await sync_to_async(self.validate)(data)
+
+            if error:
+                return error
+
+            hashed_password = await hash_password_async(data['password'])
+
+            await sync_to_async(User.objects.create)(
+                name     = data['name'],
+                email    = data['email'],
                 password = hashed_password,
                 )
 
             return JsonResponse({'MESSAGE' : 'SUCCESS'}, status = 201)
 
+        except PasswordPoolBusy:
+            return JsonResponse({'MESSAGE' : 'SERVER_BUSY'}, status = 503)
         except KeyError:
             return JsonResponse({'MESSAGE' : 'KEY_ERROR'}, status = 400)
         except ValueError:
             return JsonResponse({'MESSAGE' : 'VALUE_ERROR'}, status = 400)
 
-class SignInView(View):
-    def post(self, request):
+class AsyncSignInView(AsyncView, SignInView):
+    async def post(self, request):
         try:
-            data     = json.loads(request.body)
-            email    = data['email']
-            password = data['password']
-
-            if not (email and password):
-                return JsonResponse({'MESSAGE' : 'EMPTY_VALUE'}, status = 400)
-                
-            if not User.objects.filter(email = email).exists():
-                return JsonResponse({'MESSAGE' : 'USER_DOES_NOT_EXIST'}, status = 401)
-            
-            user = User.objects.get(email = email)
-                
-            if not bcrypt.checkpw(data['password'].encode('utf-8'), user.password.encode('utf-8')):
+            data = json.loads(request.body)
+            user = await sync_to_async(self.find_user)(data)
+
+            if isinstance(user, JsonResponse):
+                return user
+
+            if not await check_password_async(data['password'], user.password):
                 return JsonResponse({'MESSAGE' : 'INVALID_PASSWORD'}, status = 401)
 
-            token = jwt.encode({'id' : user.id}, SECRET_KEY, algorithm = 'HS256')
-            
-            return JsonResponse({'MESSAGE' : 'SUCCESS', 'TOKEN' : token}, status = 201)
+            return self.issue_token(user)
 
+        except PasswordPoolBusy:
+            return JsonResponse({'MESSAGE' : 'SERVER_BUSY'}, status = 503)
         except KeyError:
             return JsonResponse({'MESSAGE' : 'KEY_ERROR'}, status = 400)
         except ValueError:
@@ -12,5 +12,23 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'wanted.settings')
+os.environ.setdefault('WANTED_ASYNC_AUTH_VIEWS', 'True')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from posts.export import export_posts
+from posts.stream import stream_posts
+
+# Django 3.2 cannot stream a response from async context, so the streaming
+# endpoints are plain ASGI apps that bypass the Django handler.
+STREAMING_APPS = {
+    '/posts/export' : export_posts,
+    '/posts/stream' : stream_posts,
+}
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['path'] in STREAMING_APPS:
+        return await STREAMING_APPS[scope['path']](scope, receive, send)
+
+    return await django_application(scope, receive, send)
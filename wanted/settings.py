@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
+
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +46,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.ProfilingMiddleware',
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.ReplicaPinningMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -52,6 +57,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
+    'core.middleware.MicroCacheMiddleware',
 ]
 
 ROOT_URLCONF = 'wanted.urls'
@@ -78,13 +84,159 @@ WSGI_APPLICATION = 'wanted.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
+# WANTED_DB_PROFILE=production keeps connections open between requests and
+# tunes SQLite through PRAGMAs applied on every new connection (see
+# core.db.apply_sqlite_pragmas): WAL lets readers run alongside the writer.
+
+DB_PROFILE = os.environ.get('WANTED_DB_PROFILE', 'development')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('WANTED_DB_NAME', BASE_DIR / 'db.sqlite3'),
     }
 }
 
+# WANTED_REPLICA_NAME adds a read replica (a copy of the default database kept
+# in sync by `manage.py sync_replica`). Reads go to the replica unless the
+# request has written or the user wrote within REPLICA_PIN_SECONDS.
+
+REPLICA_DATABASE    = None
+REPLICA_PIN_SECONDS = 5
+DATABASE_ROUTERS    = ['core.routers.PrimaryReplicaRouter']
+
+if os.environ.get('WANTED_REPLICA_NAME'):
+    REPLICA_DATABASE = 'replica'
+
+    DATABASES['replica'] = dict(
+        DATABASES['default'],
+        NAME = os.environ['WANTED_REPLICA_NAME'],
+        TEST = {'MIRROR': 'default'},
+    )
+
+SQLITE_PRAGMAS = {}
+
+if DB_PROFILE == 'production':
+    for database in DATABASES.values():
+        database['CONN_MAX_AGE'] = 600
+
+    SQLITE_PRAGMAS = {
+        'journal_mode' : 'WAL',
+        'synchronous'  : 'NORMAL',
+        'busy_timeout' : 5000,
+        'cache_size'   : -64000,
+        'mmap_size'    : 268435456,
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# Point BACKEND/LOCATION at a shared backend (e.g. memcached) when running
+# several worker processes so that they share cached entries.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+
+IDENTITY_CACHE_ALIAS   = 'default'
+IDENTITY_CACHE_TIMEOUT = 300
+
+# Single post payloads are kept in a per-process LRU in front of
+# POST_CACHE_ALIAS. Other processes see an invalidation once their local
+# entry expires (POST_CACHE_LOCAL_TIMEOUT seconds).
+POST_CACHE_ALIAS         = 'default'
+POST_CACHE_TIMEOUT       = 300
+POST_CACHE_LOCAL_SIZE    = 1024
+POST_CACHE_LOCAL_TIMEOUT = 5
+
+# GET /posts?ids=1,2,3 resolves at most this many ids per request.
+POST_BATCH_MAX_IDS = 100
+
+
+# Bulk post creation (POST /posts/bulk)
+
+POST_BULK_MAX_ITEMS  = 10000
+POST_BULK_BATCH_SIZE = 500
+
+# Largest page size accepted by the list and search endpoints.
+POST_LIST_MAX_LIMIT = 100
+
+# /posts/list?offset=0 is served from a snapshot of the first POST_FEED_SIZE
+# posts kept in the post cache (posts/feed.py).
+POST_FEED_SIZE    = 50
+POST_FEED_TIMEOUT = 60
+
+# Anonymous GETs under MICROCACHE_PATHS are answered from a shared response
+# cache (core/microcache.py) for MICROCACHE_TIMEOUT seconds, then served
+# stale for up to MICROCACHE_STALE seconds while one request refreshes them.
+# Post writes purge it. Set MICROCACHE_TIMEOUT to 0 to turn it off.
+MICROCACHE_ALIAS   = 'default'
+MICROCACHE_TIMEOUT = 1
+MICROCACHE_STALE   = 10
+MICROCACHE_PATHS   = ('/posts', '/users/')
+
+# GET /posts/stream (ASGI only, posts/stream.py) pushes rows of the
+# post_events outbox as server-sent events. Each process polls the outbox
+# every POST_STREAM_POLL_INTERVAL seconds and keeps the last
+# POST_STREAM_BUFFER events for its open connections. Events older than
+# POST_EVENTS_RETENTION_DAYS are removed by `python manage.py prune_post_events`.
+POST_STREAM_POLL_INTERVAL  = 1
+POST_STREAM_HEARTBEAT      = 15
+POST_STREAM_RETRY_MS       = 3000
+POST_STREAM_BATCH_SIZE     = 500
+POST_STREAM_BUFFER         = 1000
+POST_EVENTS_RETENTION_DAYS = 7
+
+# GET /posts/export streams posts in keyset chunks of this size.
+POST_EXPORT_CHUNK_SIZE = 1000
+
+
+
+# POST /batch runs up to BATCH_MAX_REQUESTS sub-requests under BATCH_PATHS
+# in-process. Consecutive GETs are spread over BATCH_READ_WORKERS threads.
+
+BATCH_MAX_REQUESTS = 20
+BATCH_READ_WORKERS = int(os.environ.get('WANTED_BATCH_READ_WORKERS', 4))
+BATCH_PATHS        = ('/users', '/posts')
+
+# Password hashing
+# bcrypt runs in a dedicated process pool for the async auth views that are
+# served through wanted/asgi.py. Requests beyond PASSWORD_POOL_MAX_PENDING
+# are rejected with 503 instead of queueing.
+
+ASYNC_AUTH_VIEWS          = os.environ.get('WANTED_ASYNC_AUTH_VIEWS', 'False') == 'True'
+PASSWORD_POOL_WORKERS     = int(os.environ.get('WANTED_PASSWORD_POOL_WORKERS', 2))
+PASSWORD_POOL_MAX_PENDING = 32
+
+
+# Metrics
+# core.middleware.MetricsMiddleware records per-view histograms served at
+# /metrics. With several worker processes set WANTED_METRICS_DIR to a shared
+# directory; each process writes its snapshot there at most every
+# METRICS_FLUSH_INTERVAL seconds and /metrics merges all of them.
+
+METRICS_DIR            = os.environ.get('WANTED_METRICS_DIR')
+METRICS_FLUSH_INTERVAL = 1
+
+
+# Profiling
+# core.middleware.ProfilingMiddleware is only installed when WANTED_PROFILING
+# is True. It then runs a request under cProfile when the request carries an
+# X-Profile header signed with `python manage.py profile_token`, or for a
+# PROFILING_SAMPLE_RATE fraction of requests. Each profile is written to
+# PROFILING_DIR as <id>.prof plus <id>.sql.json and downloaded from
+# /profiles/<id> with the same header.
+
+PROFILING_ENABLED       = os.environ.get('WANTED_PROFILING', 'False') == 'True'
+PROFILING_SAMPLE_RATE   = float(os.environ.get('WANTED_PROFILING_SAMPLE_RATE', 0))
+PROFILING_DIR           = os.environ.get('WANTED_PROFILING_DIR', BASE_DIR / 'profiles')
+PROFILING_TOKEN_MAX_AGE = 60 * 60
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -1,8 +1,16 @@
+from django.apps import apps
 from django.urls import path, include
 from django.contrib import admin
 
+from core.views import BatchView, MetricsView, ProfileView
+
 urlpatterns = [
     path('users', include('users.urls')),
     path('posts', include('posts.urls')),
-    path('admin/', admin.site.urls)
+    path('batch', BatchView.as_view()),
+    path('metrics', MetricsView.as_view()),
+    path('profiles/<uuid:profile_id>', ProfileView.as_view()),
 ]
+
+if apps.is_installed('django.contrib.admin'):
+    urlpatterns.append(path('admin/', admin.site.urls))